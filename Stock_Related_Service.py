@@ -1,6 +1,14 @@
 
+import time
+render_started = time.perf_counter()
+
+import os
 import streamlit as st 
 import base64 
+from pages.utils.config import WARM_IMPORTS, SHOW_RENDER_TIMES
+from pages.utils.lazy import warm_imports
+from pages.utils.timing import mark_rendered
+from pages.utils.metrics import export as export_metrics
 
 # --- Page Config --- 
 st.set_page_config( 
@@ -23,12 +31,13 @@ st.markdown(
     """, unsafe_allow_html=True 
 ) 
 
-# --- Convert Local Image to Base64 --- 
+# --- Convert Local Image to Base64 (encoded once per server, not on every rerun) --- 
+@st.cache_resource(show_spinner=False)
 def get_base64(file): 
     with open(file, "rb") as f: 
         return base64.b64encode(f.read()).decode() 
 
-img_base64 = get_base64("stock_photo.png") 
+img_base64 = get_base64(os.path.join(os.path.dirname(os.path.abspath(__file__)), "stock_photo.png")) 
 
 # --- Custom CSS for Background + Overlay + Service Boxes --- 
 st.markdown( 
@@ -133,22 +142,36 @@ st.markdown(
 # Service 3 - Orange (faded) 
 st.markdown( 
     """ 
-    <div class="service-box" style="background-color: rgba(255, 152, 0, 0.15);"> 
-        <h3>3. CAPM Return</h3> 
-        <p>Discover how the <b>Capital Asset Pricing Model (CAPM)</b> calculates expected returns based on risk.</p> 
-    </div> 
+    <a href='/CAPM' style="text-decoration: none; color: inherit;">
+        <div class="service-box" style="background-color: rgba(255, 152, 0, 0.15);"> 
+            <h3>3. CAPM Return</h3> 
+            <p>Discover how the <b>Capital Asset Pricing Model (CAPM)</b> calculates expected returns based on risk.</p> 
+        </div> 
+    </a>
     """, unsafe_allow_html=True 
 ) 
 
 # Service 4 - Red (faded) 
 st.markdown( 
     """ 
-    <div class="service-box" style="background-color: rgba(244, 67, 54, 0.15);"> 
-        <h3>4. CAPM Beta</h3> 
-        <p>Calculate <b>Beta</b> and <b>Expected Return</b> for individual stocks to evaluate their market sensitivity.</p> 
-    </div> 
+    <a href='/CAPM' style="text-decoration: none; color: inherit;">
+        <div class="service-box" style="background-color: rgba(244, 67, 54, 0.15);"> 
+            <h3>4. CAPM Beta</h3> 
+            <p>Calculate <b>Beta</b> and <b>Expected Return</b> for individual stocks to evaluate their market sensitivity.</p> 
+        </div> 
+    </a>
     """, unsafe_allow_html=True 
 ) 
 
 st.markdown("---") 
 st.caption("⚡ Powered by Python • Streamlit • Finance APIs") 
+
+# --- Render timing ---
+render_seconds = mark_rendered("Stock_Related_Service", render_started)
+if SHOW_RENDER_TIMES:
+    st.caption(f"Rendered in {render_seconds:.3f}s")
+export_metrics()
+
+# Landing page is up: load forecasting/indicator dependencies before the user needs them
+if WARM_IMPORTS:
+    warm_imports()
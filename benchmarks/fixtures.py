@@ -0,0 +1,120 @@
+"""
+Offline price data for the benchmarks.
+
+Histories come from recorded yfinance fixtures in benchmarks/fixtures when one
+exists for the ticker, otherwise from a seeded random walk, so every run is
+reproducible and never touches the network. Which tickers fell back to synthetic
+data is reported with every benchmark run (see `sources`). Record fixtures (needs
+network) with:
+
+    python -m benchmarks.fixtures BENCH ^GSPC TSLA AAPL MSFT
+
+which writes {TICKER}.parquet and {TICKER}.info.json through the replay provider's
+`record` (the same layout `python -m pages.utils.providers` writes to STOCK_REPLAY_DIR).
+"""
+import os
+import sys
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from pages.utils.providers import ReplayProvider, record, set_provider
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Ticker -> "recorded" or "synthetic", for every history served so far
+_sources = {}
+
+# History sizes in trading days, from one month of bars up to a "MAX"-sized listing
+SIZES = {
+    "1mo": 21,
+    "6mo": 126,
+    "1y": 252,
+    "5y": 1260,
+    "max": 10000
+}
+
+
+# --- Synthetic data ---
+def random_walk(bars, seed=0, end=None):
+    """
+    Generate a daily OHLCV history shaped like yfinance output (geometric random walk).
+
+    Args:
+        bars (int): Number of business-day bars.
+        seed (int): Random seed.
+        end (pd.Timestamp, optional): Date of the last bar, defaults to today.
+
+    Returns:
+        pd.DataFrame: OHLCV bars indexed by a tz-naive 'Date'.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=end or pd.Timestamp.today().normalize(), periods=bars, name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, bars)))
+    open_ = close * (1 + rng.normal(0, 0.003, bars))
+    spread = np.abs(rng.normal(0, 0.01, bars))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) * (1 + spread),
+        "Low": np.minimum(open_, close) * (1 - spread),
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 10_000_000, bars),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0
+    }, index=index)
+
+
+# --- Recorded fixtures ---
+class FixtureProvider(ReplayProvider):
+    """Replay provider over benchmarks/fixtures that falls back to a seeded random walk."""
+
+    name = "fixtures"
+
+    def __init__(self):
+        super().__init__(FIXTURES_DIR)
+
+    def load(self, ticker):
+        history = super().load(ticker)
+        _sources[ticker.upper()] = "synthetic" if history is None else "recorded"
+        if history is None:
+            history = random_walk(SIZES["max"], seed=zlib.crc32(ticker.upper().encode()))
+        return history
+
+    def info(self, ticker):
+        return super().info(ticker) or {
+            "longName": ticker.upper(),
+            "sector": "N/A",
+            "longBusinessSummary": "Benchmark fixture."
+        }
+
+
+def load_fixture(ticker, bars=None):
+    """
+    Return the history for a ticker: the recorded fixture if present, else a random walk
+    seeded from the ticker name.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        bars (int, optional): Keep only the last `bars` rows.
+
+    Returns:
+        pd.DataFrame: OHLCV bars indexed by a tz-naive 'Date'.
+    """
+    history = FixtureProvider().load(ticker)
+    return history.tail(bars) if bars else history
+
+
+def sources():
+    """Return {ticker: "recorded" or "synthetic"} for every history served so far."""
+    return dict(sorted(_sources.items()))
+
+
+def install():
+    """Route every upstream request made from now on to the fixtures."""
+    set_provider(FixtureProvider())
+
+
+if __name__ == "__main__":
+    record(sys.argv[1:], FIXTURES_DIR)
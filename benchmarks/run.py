@@ -0,0 +1,269 @@
+"""
+Offline benchmark suite for the data, indicator, chart and forecasting code paths.
+
+Every function is timed on histories from one month to "MAX" in size (see
+fixtures.SIZES), and every page is driven end-to-end through Streamlit's
+AppTest with yfinance routed to the fixtures. No network is used. Tickers without
+a recorded fixture fall back to synthetic data; the result file lists the source of
+every ticker and the run warns about the synthetic ones (see benchmarks/fixtures.py
+to record fixtures). Results are written as JSON so runs from different commits can
+be compared:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1y 5y --skip-pages --output new.json
+    python -m benchmarks.run --compare benchmarks/results/<baseline>.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import tempfile
+import warnings
+from datetime import datetime
+
+# Isolated store, no scheduler: must be set before pages.utils.config is imported
+os.environ["STOCK_DATA_DIR"] = tempfile.mkdtemp(prefix="stock-bench-")
+os.environ.setdefault("STOCK_PRECOMPUTE", "0")
+os.environ.setdefault("STOCK_WARM_IMPORTS", "0")
+
+from benchmarks import fixtures
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+PAGES = ["Stock_Related_Service.py", "pages/Stock_Analysis.py", "pages/Stock_Prediction.py", "pages/CAPM.py"]
+
+
+# --- Timing ---
+def _time(fn, repeat, setup=None):
+    # The first call is reported on its own: it pays for lazy imports and cold caches
+    timings = []
+    for _ in range(repeat + 1):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    first, rest = timings[0], timings[1:] or timings
+    return {
+        "first_ms": round(first, 3),
+        "median_ms": round(statistics.median(rest), 3),
+        "min_ms": round(min(rest), 3),
+        "repeat": len(rest)
+    }
+
+
+def _clear_caches():
+    from pages.utils.model_cache import models
+    from pages.utils.stationarity import _reports
+    from pages.utils.figure_cache import figures
+    from pages.utils.models_trainer import lineages, scalers
+    models.clear()
+    lineages.clear()
+    scalers.clear()
+    _reports.clear()
+    figures.clear()
+
+
+# --- Function benchmarks ---
+def bench_functions(size, bars, ticker, repeat, model_repeat, order, engines):
+    """
+    Time filter_data, the indicator and chart builders and the forecasting steps on one history size.
+
+    Returns:
+        list[dict]: One result row per benchmarked call.
+    """
+    from pages.utils import utils
+    from pages.utils.indicators import compute_indicators
+    from pages.utils.models_trainer import (
+        get_rolling_mean,
+        get_differencing_order,
+        scaling,
+        fit_model,
+        evaluate_model,
+        get_forecast
+    )
+
+    history = fixtures.load_fixture(ticker, bars).reset_index()
+    indicators = compute_indicators(history)
+    forecast_frame = history.set_index("Date")[["Close"]].tail(90)
+
+    cases = [
+        ("filter_data", lambda: utils.filter_data(history.copy(), "1y")),
+        ("compute_indicators", lambda: compute_indicators(history)),
+        ("candlestick", lambda: utils.candlestick(history, "max")),
+        ("close_chart", lambda: utils.close_chart(history, "max")),
+        ("RSI", lambda: utils.RSI(history, "max")),
+        ("RSI (precomputed)", lambda: utils.RSI(history, "max", indicators)),
+        ("MACD", lambda: utils.MACD(history, "max")),
+        ("MACD (precomputed)", lambda: utils.MACD(history, "max", indicators)),
+        ("Moving_average", lambda: utils.Moving_average(history, "max")),
+        ("Moving_average_forecast", lambda: utils.Moving_average_forecast(forecast_frame)),
+    ]
+    results = [dict(name=name, size=size, bars=len(history), **_time(fn, repeat)) for name, fn in cases]
+
+    rolling = get_rolling_mean(history["Close"])
+    if len(rolling) < 60:
+        return results
+    results.append(dict(name="get_differencing_order", size=size, bars=len(history),
+                        **_time(lambda: get_differencing_order(rolling), repeat, _clear_caches)))
+
+    d = get_differencing_order(rolling)
+    scaled, _ = scaling(rolling)
+    for engine in engines:
+        engine_order = (order[0], d, order[1]) if engine == "arima" else None
+        model_cases = [
+            ("fit_model", lambda: fit_model(scaled, d, order=engine_order, engine=engine)),
+            ("evaluate_model", lambda: evaluate_model(scaled, d, order=engine_order, engine=engine)),
+            ("get_forecast", lambda: get_forecast(scaled, d, order=engine_order, engine=engine)),
+        ]
+        for name, fn in model_cases:
+            results.append(dict(name=f"{name} [{engine}]", size=size, bars=len(history),
+                                **_time(fn, model_repeat, _clear_caches)))
+
+    if "arima" not in engines:
+        return results
+
+    # Daily refresh: the forecast fit of the previous day is extended by one bar
+    arima_order = (order[0], d, order[1])
+
+    def fit_previous_day():
+        _clear_caches()
+        get_forecast(scaled[:-1], d, ticker, "bench", arima_order)
+
+    results.append(dict(name="get_forecast (one new bar) [arima]", size=size, bars=len(history),
+                        **_time(lambda: get_forecast(scaled, d, ticker, "bench", arima_order),
+                                model_repeat, fit_previous_day)))
+    return results
+
+
+# --- Page benchmarks ---
+def bench_pages(pages, timeout):
+    """
+    Run each page through AppTest twice: once on an empty store and once warm.
+
+    Returns:
+        list[dict]: One result row per page.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for page in pages:
+        app = AppTest.from_file(os.path.join(ROOT, page), default_timeout=timeout)
+        row = {"page": page}
+        for run in ("cold", "warm"):
+            started = time.perf_counter()
+            app.run()
+            row[f"{run}_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        row["charts"] = len(app.get("plotly_chart"))
+        row["errors"] = [exc.message for exc in app.exception]
+        results.append(row)
+    return results
+
+
+# --- Comparison ---
+def compare(baseline_path, current, threshold):
+    """
+    Print the median-time ratio of every benchmark against a baseline result file.
+
+    Returns:
+        int: Number of benchmarks slower than `threshold` times the baseline.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def keyed(payload):
+        rows = {(r["name"], r["size"]): r["median_ms"] for r in payload["functions"]}
+        rows.update({(r["page"], "warm"): r["warm_ms"] for r in payload["pages"]})
+        rows.update({(r["page"], "cold"): r["cold_ms"] for r in payload["pages"]})
+        return rows
+
+    old, new = keyed(baseline), keyed(current)
+    regressions = 0
+    print(f"{'benchmark':<40}{'size':>8}{'baseline ms':>14}{'current ms':>14}{'ratio':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] else float("inf")
+        flag = "  <-- slower" if ratio > threshold else ""
+        regressions += ratio > threshold
+        print(f"{key[0]:<40}{key[1]:>8}{old[key]:>14.2f}{new[key]:>14.2f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--sizes", nargs="+", default=list(fixtures.SIZES), choices=list(fixtures.SIZES),
+                        help="History sizes to benchmark")
+    parser.add_argument("--ticker", default="BENCH",
+                        help="Recorded fixture to use (falls back to a random walk)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repeats per function")
+    parser.add_argument("--model-repeat", type=int, default=2, help="Timed repeats per model function")
+    parser.add_argument("--order", default="2,2",
+                        help="ARIMA p,q for the model benchmarks (30,30 matches the fixed page order)")
+    parser.add_argument("--engines", nargs="+", default=["arima", "holt", "theta"],
+                        help="Forecast engines to benchmark")
+    parser.add_argument("--skip-models", action="store_true", help="Skip the forecasting benchmarks")
+    parser.add_argument("--skip-pages", action="store_true", help="Skip the AppTest page runs")
+    parser.add_argument("--page-timeout", type=float, default=600, help="AppTest timeout per run (seconds)")
+    parser.add_argument("--output", help="Result file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Baseline result file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    fixtures.install()
+    warnings.simplefilter("ignore")
+    p, q = (int(v) for v in args.order.split(","))
+
+    functions = []
+    for size in args.sizes:
+        started = time.perf_counter()
+        functions += bench_functions(size, fixtures.SIZES[size], args.ticker, args.repeat,
+                                     args.model_repeat, (p, q),
+                                     [] if args.skip_models else args.engines)
+        print(f"{size}: {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    pages = [] if args.skip_pages else bench_pages(PAGES, args.page_timeout)
+
+    commit = _commit()
+    payload = {
+        "commit": commit,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "arguments": vars(args),
+        "fixtures": fixtures.sources(),
+        "functions": functions,
+        "pages": pages
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+    synthetic = [ticker for ticker, source in payload["fixtures"].items() if source == "synthetic"]
+    if synthetic:
+        print(f"No recorded fixture for {', '.join(synthetic)}: benchmarked on synthetic random-walk data. "
+              f"Record fixtures with `python -m benchmarks.fixtures {' '.join(synthetic)}`.", file=sys.stderr)
+
+    if args.compare:
+        return 1 if compare(args.compare, payload, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# CAPM Return & Beta
+import time
+render_started = time.perf_counter()
+
+import streamlit as st
+import pandas as pd
+from pages.utils.capm import load_closes, analyze, returns_matrix
+from pages.utils.data_store import period_start
+from pages.utils.utils import beta_chart, security_market_line, rolling_beta_chart
+from pages.utils.config import POPULAR_TICKERS, MARKET_INDEX, RISK_FREE_RATE, TRADING_DAYS, SHOW_RENDER_TIMES, DEBUG_PANEL
+from pages.utils.timing import mark_rendered
+from pages.utils.metrics import start_trace, span, show_debug_panel, export as export_metrics
+
+start_trace()
+
+# --- Page Config ---
+st.set_page_config(
+    page_title="CAPM",
+    page_icon="chart_with_upwards_trend",
+    layout="wide"
+)
+
+st.title("CAPM Return & Beta")
+st.markdown("""
+Estimate each stock's **Beta** against a market index, its **Alpha**, and the **Expected Return**
+implied by the Capital Asset Pricing Model: E[R] = Rf + Beta x (E[Rm] - Rf).
+""")
+
+# --- Inputs ---
+col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+with col1:
+    tickers = st.multiselect("Select Stocks", POPULAR_TICKERS, default=POPULAR_TICKERS[:4])
+    extra = st.text_input("Add tickers (comma separated)", "")
+    tickers = list(dict.fromkeys(tickers + [t.strip().upper() for t in extra.split(",") if t.strip()]))
+with col2:
+    period = st.selectbox("Period", ["1y", "2y", "5y", "10y"], index=2)
+with col3:
+    market = st.text_input("Market Index", MARKET_INDEX).strip().upper() or MARKET_INDEX
+with col4:
+    risk_free_rate = st.number_input("Risk-free Rate (%)", min_value=0.0, max_value=20.0,
+                                     value=RISK_FREE_RATE * 100, step=0.25) / 100
+
+if not tickers:
+    st.info("Select at least one stock.")
+    st.stop()
+
+# --- Data ---
+start = period_start(pd.Timestamp.today().normalize(), period)
+with span("fetch_history"), st.spinner(f"Loading {len(tickers) + 1} price histories..."):
+    closes, failed = load_closes(tickers, start=start, market=market)
+if market in failed:
+    st.error(f"Market index {market} could not be loaded ({failed[market]}).")
+    st.stop()
+if failed:
+    st.warning("Skipped: " + ", ".join(f"{symbol} ({reason})" for symbol, reason in failed.items()))
+if closes.shape[1] < 2:
+    st.stop()
+
+window = st.slider("Rolling Beta Window (trading days)", min_value=20, max_value=TRADING_DAYS,
+                   value=60, step=5)
+
+with span("capm"):
+    capm_table, betas = analyze(closes, market=market, risk_free_rate=risk_free_rate, window=window)
+market_return = float(returns_matrix(closes)[market].mean() * TRADING_DAYS)
+
+# --- CAPM Return ---
+st.subheader("CAPM Return")
+mcol1, mcol2, mcol3 = st.columns(3)
+mcol1.metric(f"{market} Annual Return", f"{market_return:.2%}")
+mcol2.metric("Risk-free Rate", f"{risk_free_rate:.2%}")
+mcol3.metric("Market Risk Premium", f"{market_return - risk_free_rate:.2%}")
+
+st.dataframe(
+    capm_table.sort_values("Expected Return", ascending=False).style.format({
+        "Beta": "{:.3f}",
+        "Alpha": "{:.2%}",
+        "Expected Return": "{:.2%}",
+        "Annual Return": "{:.2%}",
+        "R2": "{:.3f}",
+        "Observations": "{:.0f}"
+    }),
+    use_container_width=True
+)
+st.plotly_chart(security_market_line(capm_table, risk_free_rate, market_return), use_container_width=True)
+
+# --- CAPM Beta ---
+st.subheader("CAPM Beta")
+st.plotly_chart(beta_chart(capm_table), use_container_width=True)
+
+st.write(f"#### Rolling {window}-day Beta")
+shown = st.multiselect("Show", list(betas.columns), default=list(betas.columns[:5]))
+if shown:
+    st.plotly_chart(rolling_beta_chart(betas[shown]), use_container_width=True)
+
+# --- Render timing ---
+render_seconds = mark_rendered("CAPM", render_started)
+if SHOW_RENDER_TIMES:
+    st.caption(f"Rendered in {render_seconds:.3f}s")
+if DEBUG_PANEL:
+    show_debug_panel(render_seconds)
+export_metrics()
@@ -1,9 +1,22 @@
 # Stock Analysis
+import time
+render_started = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import datetime
-from pages.utils.utils import candlestick, RSI, MACD, close_chart, Moving_average
+from pages.utils.utils import candlestick, RSI, MACD, close_chart, Moving_average, filter_data
+from pages.utils.data_store import load_history, load_indicators
+from pages.utils.fetch_planner import plan_start
+from pages.utils.fundamentals import get_info, preload
+from pages.utils.precompute import start_scheduler
+from pages.utils.figure_cache import figures, data_version
+from pages.utils.timing import mark_rendered
+from pages.utils.metrics import start_trace, span, show_debug_panel, export as export_metrics
+from pages.utils.page_loader import submit, wait
+from pages.utils.config import SHOW_RENDER_TIMES, DEBUG_PANEL, MARKET_INDEX
+
+start_trace()
 
 # --- Page Config ---
 st.set_page_config(
@@ -24,6 +37,12 @@ st.sidebar.header("Select or Enter Stock")
 # Popular tickers for dropdown
 popular_tickers = ["TSLA", "AAPL", "MSFT", "GOOGL", "AMZN", "NFLX"]
 
+# Warm the shared fundamentals cache so the metrics panel renders without a round-trip
+preload(popular_tickers)
+
+# After-close precompute for popular tickers (no-op unless STOCK_PRECOMPUTE=1)
+start_scheduler()
+
 # Dropdown
 selected_ticker = st.sidebar.selectbox("Choose a stock from list", popular_tickers, index=0)
 
@@ -55,51 +74,34 @@ period_map = {
 
 num_period = period_map[period_option]
 
-# --- Fetch Historical Data ---
-if isinstance(num_period, int):
-    data = yf.Ticker(ticker).history(period="max").tail(num_period).reset_index()
-else:
-    data = yf.Ticker(ticker).history(period="max").reset_index()
-
-# Remove timezone for plotting
-data['Date'] = data['Date'].dt.tz_localize(None)
+# --- Fetch Data (concurrently) ---
+# History, fundamentals and the market index are requested together; the page waits
+# on each only where it is first needed. Only the selected period plus the
+# indicators' warm-up bars are requested.
+start = plan_start(num_period)
+history_request = submit("fetch_history", load_history, ticker, start=start)
+info_request = submit("company_info", get_info, ticker)
+index_request = submit("fetch_index", load_history, MARKET_INDEX, start=start)
+
+with span("wait.history"):
+    history, error = wait(history_request)
+if error is not None:
+    st.error(f"Price data for {ticker} could not be loaded ({error}).")
+    st.stop()
+history = history.reset_index()
+if history.empty:
+    st.error(f"No price data found for {ticker}.")
+    st.stop()
+data = filter_data(history, num_period)
 
 st.subheader(f"Historical Data for {ticker}")
 st.dataframe(data)
 
-# --- Company Info ---
-ticker_info = yf.Ticker(ticker).info
-st.subheader(f"Company Information: {ticker}")
-st.write(ticker_info.get("longBusinessSummary", "No description available."))
-st.write("**Sector:**", ticker_info.get("sector", "N/A"))
-st.write("**Industry:**", ticker_info.get("industry", "N/A"))
-st.write("**Website:**", ticker_info.get("website", "N/A"))
-st.write("**Full Time Employees:**", ticker_info.get("fullTimeEmployees", "N/A"))
-
-# --- Key Metrics ---
-st.subheader("Key Financial Metrics")
-col1, col2 = st.columns(2)
-
-with col1:
-    df = pd.DataFrame(index=["Market Cap", "Beta", "EPS", "PE Ratio"])
-    df['Value'] = [
-        ticker_info.get("marketCap") or "N/A",
-        ticker_info.get("beta") or "N/A",
-        ticker_info.get("trailingEps") or "N/A",
-        ticker_info.get("trailingPE") or "N/A"
-    ]
-    st.dataframe(df)
-
-with col2:
-    df2 = pd.DataFrame(index=["Quick Ratio", "Revenue per Share", "Profit Margins", "Debt to Equity", "Return on Assets"])
-    df2['Value'] = [
-        ticker_info.get("quickRatio") or "N/A",
-        ticker_info.get("revenuePerShare") or "N/A",
-        ticker_info.get("profitMargins") or "N/A",
-        ticker_info.get("debtToEquity") or "N/A",
-        ticker_info.get("returnOnAssets") or "N/A"
-    ]
-    st.dataframe(df2)
+# --- Company Info & Key Metrics ---
+# Slot is filled after the charts, so prices render without waiting for fundamentals
+info_slot = st.container()
+info_status = info_slot.empty()
+info_status.info("Loading company information...")
 
 # --- Latest Close Price ---
 st.subheader("Latest Close Price")
@@ -115,6 +117,21 @@ elif len(data) == 1:
 else:
     st.warning("No data available for the selected date range.")
 
+# Market comparison over the same period
+with span("wait.index"):
+    index_history, error = wait(index_request)
+if error is None and not index_history.empty and len(data) >= 2:
+    index_data = filter_data(index_history.reset_index(), num_period)
+    period_return = float(data['Close'].iloc[-1] / data['Close'].iloc[0] - 1)
+    if len(index_data) >= 2:
+        index_return = float(index_data['Close'].iloc[-1] / index_data['Close'].iloc[0] - 1)
+        col2.metric("Period Return", f"{period_return:.2%}", f"{period_return - index_return:+.2%} vs {MARKET_INDEX}")
+        index_close = float(index_data['Close'].iloc[-1])
+        index_change = index_close - float(index_data['Close'].iloc[-2])
+        col3.metric(f"{MARKET_INDEX} Close", f"{index_close:,.2f}", f"{index_change:,.2f}")
+elif error is not None:
+    col3.caption(f"{MARKET_INDEX} unavailable ({error}).")
+
 # --- Table: Last N Days ---
 st.subheader(f"Historical Table: {period_option}")
 st.dataframe(data.tail(10).sort_index(ascending=False).round(4))
@@ -131,25 +148,92 @@ with col2:
         indicator = st.selectbox("Select Indicator", ['RSI', "MACD", "Moving Average"])
 
 # --- Plot Charts ---
+# Indicators are kept up to date incrementally in the store and shared by every chart builder
+with span("indicators"):
+    indicators = (load_indicators(ticker, start=history['Date'].iloc[0])
+                  .reindex(history['Date'])
+                  .set_axis(history.index))
+
+# Serialized figures are shared across sessions, keyed by the view and the data version.
+# Candlesticks are built from at most MAX_CHART_POINTS downsampled bars, which is cheaper
+# than restoring their JSON, so they are not cached
+version = data_version(history)
+
+
+def show_chart(name, build, cached=True):
+    with span(f"chart.{name}"):
+        fig = figures.figure((ticker, str(num_period), name, version), build) if cached else build()
+        st.plotly_chart(fig, use_container_width=True)
+
+
 if chart_type == 'CandleStick' and indicator == 'RSI':
-    st.plotly_chart(candlestick(data, num_period), use_container_width=True)
-    st.plotly_chart(RSI(data, num_period), use_container_width=True)
+    show_chart("candlestick", lambda: candlestick(history, num_period), cached=False)
+    show_chart("RSI", lambda: RSI(history, num_period, indicators))
 
 elif chart_type == 'CandleStick' and indicator == 'MACD':
-    st.plotly_chart(candlestick(data, num_period), use_container_width=True)
-    st.plotly_chart(MACD(data, num_period), use_container_width=True)
+    show_chart("candlestick", lambda: candlestick(history, num_period), cached=False)
+    show_chart("MACD", lambda: MACD(history, num_period, indicators))
 
 elif chart_type == 'Line' and indicator == 'RSI':
-    st.plotly_chart(close_chart(data, num_period), use_container_width=True)
-    st.plotly_chart(RSI(data, num_period), use_container_width=True)
+    show_chart("line", lambda: close_chart(history, num_period))
+    show_chart("RSI", lambda: RSI(history, num_period, indicators))
 
 elif chart_type == 'Line' and indicator == 'Moving Average':
-    st.plotly_chart(Moving_average(data, num_period), use_container_width=True)
+    show_chart("moving_average", lambda: Moving_average(history, num_period, indicators))
 
 elif chart_type == 'Line' and indicator == 'MACD':
-    st.plotly_chart(close_chart(data, num_period), use_container_width=True)
-    st.plotly_chart(MACD(data, num_period), use_container_width=True)
+    show_chart("line", lambda: close_chart(history, num_period))
+    show_chart("MACD", lambda: MACD(history, num_period, indicators))
 
 # --- Footer ---
 st.markdown("---")
 st.markdown("Dashboard powered by **Streamlit** | Data Source: **Yahoo Finance**")
+
+# --- Company Info & Key Metrics (into the slot above) ---
+with span("wait.company_info"):
+    ticker_info, error = wait(info_request)
+info_status.empty()
+if error is not None:
+    info_slot.warning(f"Company information for {ticker} is unavailable ({error}).")
+    ticker_info = {}
+
+with info_slot:
+    st.subheader(f"Company Information: {ticker}")
+    st.write(ticker_info.get("longBusinessSummary", "No description available."))
+    st.write("**Sector:**", ticker_info.get("sector", "N/A"))
+    st.write("**Industry:**", ticker_info.get("industry", "N/A"))
+    st.write("**Website:**", ticker_info.get("website", "N/A"))
+    st.write("**Full Time Employees:**", ticker_info.get("fullTimeEmployees", "N/A"))
+
+    # --- Key Metrics ---
+    st.subheader("Key Financial Metrics")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        df = pd.DataFrame(index=["Market Cap", "Beta", "EPS", "PE Ratio"])
+        df['Value'] = [
+            ticker_info.get("marketCap") or "N/A",
+            ticker_info.get("beta") or "N/A",
+            ticker_info.get("trailingEps") or "N/A",
+            ticker_info.get("trailingPE") or "N/A"
+        ]
+        st.dataframe(df)
+
+    with col2:
+        df2 = pd.DataFrame(index=["Quick Ratio", "Revenue per Share", "Profit Margins", "Debt to Equity", "Return on Assets"])
+        df2['Value'] = [
+            ticker_info.get("quickRatio") or "N/A",
+            ticker_info.get("revenuePerShare") or "N/A",
+            ticker_info.get("profitMargins") or "N/A",
+            ticker_info.get("debtToEquity") or "N/A",
+            ticker_info.get("returnOnAssets") or "N/A"
+        ]
+        st.dataframe(df2)
+
+# --- Render timing ---
+render_seconds = mark_rendered("Stock_Analysis", render_started)
+if SHOW_RENDER_TIMES:
+    st.caption(f"Rendered in {render_seconds:.3f}s")
+if DEBUG_PANEL:
+    show_debug_panel(render_seconds)
+export_metrics()
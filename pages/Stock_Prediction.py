@@ -1,3 +1,6 @@
+import time
+render_started = time.perf_counter()
+
 import streamlit as st
 from pages.utils.models_trainer import (
     get_data,
@@ -8,10 +11,31 @@ from pages.utils.models_trainer import (
     get_forecast,
     inverse_scaling
 )
+from pages.utils.order_search import select_order
+from pages.utils.backtest import backtest
+from pages.utils.artifacts import load_artifact
+from pages.utils.config import (
+    POPULAR_TICKERS,
+    PREDICTION_PERIODS,
+    DEFAULT_ENGINE,
+    SHOW_RENDER_TIMES,
+    DEBUG_PANEL,
+    SERVICE_URL,
+    SERVICE_POLL_SECONDS
+)
+from pages.utils.precompute import forecast_artifact_name, start_scheduler
+from pages.utils.engines import ENGINES
 from pages.utils.utils import Moving_average_forecast
+from pages.utils.figure_cache import figures
+from pages.utils.model_cache import fingerprint
+from pages.utils.timing import mark_rendered
+from pages.utils.metrics import start_trace, span, show_debug_panel, export as export_metrics
+from pages.utils.service import ServiceClient, ServiceError, frame_from_json
 import pandas as pd
 import datetime
 
+start_trace()
+
 # --- Page Config ---
 st.set_page_config(
     page_title="Stock Prediction",
@@ -21,6 +45,9 @@ st.set_page_config(
 
 st.title("Stock Prediction (ARIMA Forecast)")
 
+# After-close precompute for popular tickers (no-op unless STOCK_PRECOMPUTE=1)
+start_scheduler()
+
 # --- Input Layout ---
 col1, col2, col3 = st.columns([1, 3, 1])
 today = datetime.date.today()
@@ -29,7 +56,7 @@ today = datetime.date.today()
 with col1:
     ticker = st.selectbox(
         "Select a Ticker",
-        ["TSLA", "AAPL", "MSFT", "GOOGL", "AMZN", "NFLX", "META", "NVDA", "IBM", "ORCL"],
+        POPULAR_TICKERS,
         index=1
     )
     custom_ticker = st.text_input("Or Enter Custom Ticker", "")
@@ -40,9 +67,19 @@ with col1:
 with col2:
     period = st.selectbox(
         "Select Period",
-        ["6mo", "1y", "2y", "5y", "10y", "ytd", "max"],
+        PREDICTION_PERIODS,
         index=2
     )
+    # Default engine first, the slow ARIMA last
+    engine_labels = {ENGINES[name].label: name
+                     for name in sorted(ENGINES, key=lambda name: (name == "arima", name != DEFAULT_ENGINE))}
+    engine = engine_labels[st.selectbox("Forecast Engine", list(engine_labels), index=0)]
+    if engine == "arima":
+        order_mode = st.selectbox(
+            "Model Order",
+            ["Auto (AIC)", "Auto (BIC)", "Fixed (30, d, 30)"],
+            index=0
+        )
 
 with col3:
     st.write("Today's Date:")
@@ -51,22 +88,136 @@ with col3:
 st.subheader(f"Predicting Next 30 days Close Price for: {ticker}")
 
 # --- Data Prep ---
-close_price = get_data(ticker, period)['Close']
+with span("fetch_history"):
+    try:
+        close_price = get_data(ticker, period)['Close']
+    except ValueError as error:
+        st.error(str(error))
+        st.stop()
 rolling_price = get_rolling_mean(close_price)
 
-# Differencing order
-differencing_order = get_differencing_order(rolling_price)
+# Precomputed (ARIMA) results from the after-close scheduler are used when fresh
+precomputed = None
+if engine == "arima" and order_mode != "Fixed (30, d, 30)":
+    criterion = "bic" if order_mode == "Auto (BIC)" else "aic"
+    with span("load_precomputed"):
+        precomputed = load_artifact("forecast", forecast_artifact_name(ticker, period, criterion))
+
+
+# --- Analysis service (optional) ---
+@st.fragment(run_every=SERVICE_POLL_SECONDS)
+def show_job_progress(client, job_id):
+    # Polls without rerunning the page; the page reruns once the job has finished
+    try:
+        job = client.job(job_id)
+    except ServiceError as error:
+        st.warning(f"Lost contact with the analysis service ({error}).")
+        return
+    if job["status"] in ("done", "failed"):
+        st.rerun()
+    if job["status"] == "queued":
+        st.info(f"Forecast queued (position {job.get('position', 0) + 1}), {job['seconds']:.0f}s...")
+    else:
+        st.info(f"Fitting the model on the analysis service, {job['seconds']:.0f}s...")
+
+
+def forecast_from_service(ticker, period, engine, order_mode):
+    """
+    Submit the forecast to the analysis service (identical pending jobs are shared).
+
+    Returns:
+        dict or None: Results in the precomputed artifact's layout, or None to fit in
+            this session because the service is unreachable. Stops the page while the
+            job is still queued or running.
+    """
+    client = ServiceClient(SERVICE_URL)
+    try:
+        job = client.submit("forecast", ticker=ticker, period=period, engine=engine, order_mode=order_mode)
+        if job["status"] == "done":
+            job = client.job(job["id"])
+    except ServiceError as error:
+        st.warning(f"Analysis service unavailable ({error}); fitting in this session.")
+        return None
 
-# Scaling
-scaled_data, scaler = scaling(rolling_price)
+    if job["status"] == "failed":
+        st.error(f"Forecast failed: {job['error']}")
+        st.stop()
+    if job["status"] != "done":
+        show_job_progress(client, job["id"])
+        st.stop()
 
-# RMSE Evaluation
-rmse = evaluate_model(scaled_data, differencing_order)
+    result = job["result"]
+    return {
+        "differencing_order": result["differencing_order"],
+        "order": tuple(result["order"]) if result["order"] is not None else None,
+        "rmse": result["rmse"],
+        "forecast": frame_from_json(result["forecast"])
+    }
+
+
+# With a service configured, fits run there and this rerun only submits and polls
+if precomputed is None and SERVICE_URL:
+    order_modes = {"Auto (AIC)": "aic", "Auto (BIC)": "bic", "Fixed (30, d, 30)": "fixed"}
+    with span("service.forecast"):
+        precomputed = forecast_from_service(ticker, period, engine,
+                                            order_modes[order_mode] if engine == "arima" else "aic")
+
+if precomputed is not None:
+    differencing_order = precomputed["differencing_order"]
+    order = precomputed["order"]
+    rmse = precomputed["rmse"]
+else:
+    # Differencing order
+    with span("differencing_order"):
+        differencing_order = get_differencing_order(rolling_price)
+
+    # Scaling (kept while only new bars arrive, so yesterday's fits can be extended)
+    scaled_data, scaler = scaling(rolling_price, ticker, period)
+
+    # Order selection: budgeted (p, q) grid search, remembered per ticker (ARIMA only)
+    if engine != "arima":
+        order = None
+    elif order_mode == "Fixed (30, d, 30)":
+        order = (30, differencing_order, 30)
+    else:
+        with span("order_search"):
+            order = select_order(scaled_data, differencing_order, ticker, criterion=criterion, period=period)
+
+    # RMSE Evaluation
+    with span("evaluate_model"):
+        rmse = evaluate_model(scaled_data, differencing_order, ticker, period, order, engine)
+
+if order is not None:
+    st.write("**Model Order (p, d, q):**", order)
 st.write("**Model RMSE Score:**", rmse)
 
+# --- Rolling-origin backtest (on demand, folds run in parallel) ---
+with st.expander("Backtest Forecast Accuracy"):
+    bcol1, bcol2, bcol3 = st.columns(3)
+    folds = bcol1.slider("Folds", min_value=2, max_value=20, value=5)
+    stride = bcol2.slider("Stride (days)", min_value=5, max_value=60, value=30, step=5)
+    window = bcol3.selectbox("Window", ["expanding", "rolling"])
+    if st.button("Run Backtest"):
+        try:
+            with span("backtest"):
+                per_fold, summary = backtest(rolling_price, differencing_order, order,
+                                             folds=folds, stride=stride, window=window, engine=engine)
+        except ValueError as error:
+            st.warning(f"Backtest not possible: {error}.")
+        else:
+            failed = per_fold["Error"].notna().sum()
+            if failed:
+                st.warning(f"{failed} of {len(per_fold)} folds failed to fit; the average covers the rest.")
+            st.write("**Average:**", summary)
+            st.dataframe(per_fold.round(4))
+
 # --- Forecast next 30 days ---
-forecast_scaled = get_forecast(scaled_data, differencing_order)
-forecast_scaled['Close'] = inverse_scaling(scaler, forecast_scaled['Close'])
+if precomputed is not None:
+    forecast_scaled = precomputed["forecast"]
+else:
+    with span("get_forecast"):
+        forecast_scaled = get_forecast(scaled_data, differencing_order, ticker, period, order, engine)
+    forecast_scaled['Close'] = inverse_scaling(scaler, forecast_scaled['Close'])
 
 # --- Display Forecast ---
 st.write("#### Forecast Data (Next 30 Days)")
@@ -74,4 +225,16 @@ st.dataframe(forecast_scaled.sort_index(ascending=True).round(3), height=250)
 
 # --- Merge for Visualization ---
 visual_df = pd.concat([rolling_price[-60:], forecast_scaled])  # last 60 days + forecast
-st.plotly_chart(Moving_average_forecast(visual_df), use_container_width=True)
+forecast_key = (ticker, period, "forecast", engine, order,
+                str(visual_df.index[-1]), fingerprint(visual_df["Close"]))
+with span("chart.forecast"):
+    st.plotly_chart(figures.figure(forecast_key, lambda: Moving_average_forecast(visual_df)),
+                    use_container_width=True)
+
+# --- Render timing ---
+render_seconds = mark_rendered("Stock_Prediction", render_started)
+if SHOW_RENDER_TIMES:
+    st.caption(f"Rendered in {render_seconds:.3f}s")
+if DEBUG_PANEL:
+    show_debug_panel(render_seconds)
+export_metrics()
@@ -0,0 +1,53 @@
+import os
+import pickle
+from datetime import datetime
+
+from pages.utils.config import DATA_DIR
+from pages.utils.market_hours import MARKET_TZ, last_close
+from pages.utils.metrics import cache_result
+
+
+ARTIFACTS_DIR = os.path.join(DATA_DIR, "artifacts")
+
+
+def _path(kind, name):
+    return os.path.join(ARTIFACTS_DIR, kind, f"{name}.pkl")
+
+
+def save_artifact(kind, name, value):
+    """
+    Store a precomputed result.
+
+    Args:
+        kind (str): Artifact family (e.g., "forecast").
+        name (str): Entry name within the family (e.g., "AAPL_2y_aic").
+        value (object): Any picklable result.
+    """
+    path = _path(kind, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"created_at": datetime.now(MARKET_TZ), "value": value}, f)
+    os.replace(tmp_path, path)
+
+
+def load_artifact(kind, name):
+    """
+    Return a precomputed result if it was built after the most recent market close.
+
+    Args:
+        kind (str): Artifact family (e.g., "forecast").
+        name (str): Entry name within the family.
+
+    Returns:
+        object or None: Stored value, or None when the entry is missing or stale.
+    """
+    try:
+        with open(_path(kind, name), "rb") as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        cache_result("artifacts", False)
+        return None
+    fresh = entry["created_at"] >= last_close()
+    cache_result("artifacts", fresh)
+    return entry["value"] if fresh else None
@@ -0,0 +1,163 @@
+import os
+import warnings
+import traceback
+
+import numpy as np
+import pandas as pd
+
+from pages.utils.config import DATA_DIR, MODEL_CACHE_SIZE, MODEL_CACHE_PERSIST
+from pages.utils.engines import get_engine
+from pages.utils.model_cache import ModelCache, fingerprint
+from pages.utils.workers import get_pool
+
+
+# Finished backtests, keyed by data fingerprint and every backtest setting
+backtests = ModelCache(
+    maxsize=MODEL_CACHE_SIZE,
+    persist_dir=os.path.join(DATA_DIR, "backtests") if MODEL_CACHE_PERSIST else None,
+    name="backtests"
+)
+
+
+# --- Worker side ---
+def _run_fold(train, test, differencing_order, order, engine):
+    # Runs in a worker process: fit on the train window and score the forecast
+    from sklearn.metrics import (
+        mean_squared_error,
+        mean_absolute_error,
+        mean_absolute_percentage_error,
+        r2_score
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = get_engine(engine).fit(train, differencing_order, order)
+    predictions = model.forecast(len(test))
+    return {
+        "RMSE": float(np.sqrt(mean_squared_error(test, predictions))),
+        "MAE": float(mean_absolute_error(test, predictions)),
+        "MAPE": float(mean_absolute_percentage_error(test, predictions)),
+        "R2": float(r2_score(test, predictions))
+    }
+
+
+# --- Fold layout ---
+METRICS = ["RMSE", "MAE", "MAPE", "R2"]
+# Smallest train window for any engine, and bars per estimated ARIMA parameter
+MIN_TRAIN_BARS = 10
+BARS_PER_PARAMETER = 2
+
+
+def required_train(order=None, engine="arima"):
+    """
+    Smallest train window a fold can be fitted on: two bars per ARIMA parameter
+    (p + q + 1) after differencing, and MIN_TRAIN_BARS for any engine.
+
+    Args:
+        order (tuple, optional): ARIMA (p, d, q) order.
+        engine (str): Forecast engine name.
+
+    Returns:
+        int: Minimum train size in bars.
+    """
+    if engine != "arima" or order is None:
+        return MIN_TRAIN_BARS
+    p, d, q = order
+    return max(MIN_TRAIN_BARS, d + BARS_PER_PARAMETER * (p + q + 1))
+
+
+def make_folds(n, folds=5, stride=30, horizon=30, window="expanding", min_train=None, required=0):
+    """
+    Lay out rolling-origin folds over a series of length n, latest fold last.
+
+    Args:
+        n (int): Series length.
+        folds (int): Number of folds.
+        stride (int): Bars between consecutive forecast origins.
+        horizon (int): Bars forecast (and scored) per fold.
+        window (str): "expanding" keeps every bar before the origin, "rolling"
+            keeps a fixed-size window.
+        min_train (int, optional): Rolling window size. Defaults to the train
+            size of the earliest fold.
+        required (int): Smallest train size the model can be fitted on (see required_train).
+
+    Returns:
+        list[tuple[int, int, int]]: (train_start, origin, test_end) index triples.
+
+    Raises:
+        ValueError: If the series is too short for any fold, or a fold's train window
+            is smaller than required.
+    """
+    origins = [n - horizon - i * stride for i in range(folds)][::-1]
+    origins = [origin for origin in origins if origin > 0]
+    if not origins:
+        raise ValueError("Series is too short for the requested backtest")
+
+    size = min_train or origins[0]
+    layout = []
+    for origin in origins:
+        train_start = max(0, origin - size) if window == "rolling" else 0
+        layout.append((train_start, origin, origin + horizon))
+
+    smallest = min(origin - train_start for train_start, origin, _ in layout)
+    if smallest < required:
+        raise ValueError(f"The earliest fold trains on {smallest} bars but the model needs at least "
+                         f"{required}; use fewer folds, a smaller stride or a longer period")
+    return layout
+
+
+# --- Engine ---
+def backtest(data, differencing_order, order=None, folds=5, stride=30, horizon=30,
+             window="expanding", min_train=None, engine="arima"):
+    """
+    Rolling-origin backtest of a forecast engine, with the folds fitted in parallel.
+
+    Args:
+        data (np.ndarray or pd.Series): Series to backtest (use unscaled prices for a meaningful MAPE).
+        differencing_order (int): Differencing order d.
+        order (tuple, optional): Model order. For ARIMA it defaults to (30, d, 30) like fit_model.
+        folds (int): Number of folds.
+        stride (int): Bars between consecutive forecast origins.
+        horizon (int): Bars forecast per fold.
+        window (str): "expanding" or "rolling" (see make_folds).
+        min_train (int, optional): Rolling window size.
+        engine (str): Forecast engine name (see engines.ENGINES).
+
+    Returns:
+        tuple[pd.DataFrame, dict]: Per-fold RMSE, MAE, MAPE and R2 (NaN plus an Error
+            message for folds that failed to fit), and their means over the successful folds.
+
+    Raises:
+        ValueError: If the fold layout does not fit the series (see make_folds).
+    """
+    if engine == "arima":
+        order = tuple(order or (30, differencing_order, 30))
+    values = np.asarray(data, dtype=float).ravel()
+    key = (fingerprint(values), differencing_order, order, folds, stride, horizon, window, min_train, engine)
+    cached = backtests.get(key)
+    if cached is not None:
+        return cached
+
+    layout = make_folds(len(values), folds, stride, horizon, window, min_train,
+                        required=required_train(order, engine))
+    pool = get_pool()
+    futures = [pool.submit(_run_fold, values[start:origin], values[origin:end], differencing_order, order, engine)
+               for start, origin, end in layout]
+
+    rows = []
+    for (start, origin, end), future in zip(layout, futures):
+        row = {"Train Size": origin - start, "Origin": origin}
+        try:
+            row.update(future.result())
+            row["Error"] = None
+        except Exception as error:
+            # One fold failing to fit is reported in its row instead of failing the whole backtest
+            row.update({metric: np.nan for metric in METRICS})
+            row["Error"] = "".join(traceback.format_exception_only(type(error), error)).strip()
+        rows.append(row)
+
+    per_fold = pd.DataFrame(rows, index=pd.RangeIndex(1, len(rows) + 1, name="Fold"))
+    summary = per_fold[METRICS].mean().round(4).to_dict()
+    result = (per_fold, summary)
+    if per_fold["Error"].isna().all():
+        backtests.put(key, result)
+    return result
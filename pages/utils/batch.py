@@ -0,0 +1,186 @@
+"""
+Batch forecasting for whole watchlists.
+
+Usage:
+    python -m pages.utils.batch AAPL MSFT TSLA --period 2y --out forecasts.parquet
+"""
+import os
+import sys
+import time
+import argparse
+import traceback
+from concurrent.futures import wait, FIRST_COMPLETED
+
+import pandas as pd
+
+from pages.utils.config import BATCH_TASK_TIMEOUT_SECONDS, MODEL_WORKERS
+from pages.utils.workers import new_pool, terminate
+
+
+# --- Worker side ---
+def forecast_ticker(ticker, period="2y", criterion="aic", order=None):
+    """
+    Run the prediction page's pipeline for one ticker and return the 30-day forecast.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        period (str): Data period (e.g., "1y", "2y", "5y").
+        criterion (str): "aic" or "bic" for the order search.
+        order (tuple, optional): Fixed (p, q) order, skips the search.
+
+    Returns:
+        pd.DataFrame: Forecast with a 'Close' column in price units, indexed by date.
+    """
+    from pages.utils.models_trainer import (
+        get_data,
+        get_rolling_mean,
+        get_differencing_order,
+        scaling,
+        get_forecast,
+        inverse_scaling
+    )
+    from pages.utils.order_search import select_order
+
+    close_price = get_data(ticker, period)['Close']
+    rolling_price = get_rolling_mean(close_price)
+    differencing_order = get_differencing_order(rolling_price)
+    scaled_data, scaler = scaling(rolling_price, ticker, period)
+
+    if order is None:
+        # Already inside a pool worker, so search serially
+        order = select_order(scaled_data, differencing_order, ticker, criterion=criterion, parallel=False,
+                             period=period)
+    else:
+        order = (order[0], differencing_order, order[1])
+
+    forecast = get_forecast(scaled_data, differencing_order, ticker, period, order)
+    forecast['Close'] = inverse_scaling(scaler, forecast['Close']).ravel()
+    return forecast
+
+
+def _run_task(ticker, period, criterion, order):
+    # Runs in a worker process; time limits are enforced by the parent (see run_batch)
+    started = time.perf_counter()
+    try:
+        forecast = forecast_ticker(ticker, period, criterion, order)
+        return ticker, forecast, "ok", None, time.perf_counter() - started
+    except Exception as error:
+        message = "".join(traceback.format_exception_only(type(error), error)).strip()
+        return ticker, None, "failed", message, time.perf_counter() - started
+
+
+# --- Batch API ---
+def run_batch(tickers, period="2y", criterion="aic", order=None, timeout=BATCH_TASK_TIMEOUT_SECONDS):
+    """
+    Forecast many tickers in parallel, MODEL_WORKERS at a time, each in its own worker
+    process. A ticker past its time limit has its worker killed and replaced.
+
+    Args:
+        tickers (list[str]): Ticker symbols.
+        period (str): Data period for every ticker.
+        criterion (str): "aic" or "bic" for the order search.
+        order (tuple, optional): Fixed (p, q) order for every ticker.
+        timeout (float): Per-ticker time limit in seconds (0 disables it).
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Forecasts in long format (Ticker, Date, Close)
+            and a per-ticker report (Ticker, Status, Seconds, Error).
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    results = {}
+    # One single-process pool per slot, so a ticker past its limit is stopped by killing
+    # only its own worker (never by interrupting it mid-write or while holding a lock)
+    idle = [new_pool(1) for _ in range(min(MODEL_WORKERS, len(tickers)))]
+    running = {}
+    queue = list(tickers)
+    try:
+        while queue or running:
+            while queue and idle:
+                slot, ticker = idle.pop(), queue.pop(0)
+                future = slot.submit(_run_task, ticker, period, criterion, order)
+                running[future] = (ticker, time.monotonic(), slot)
+
+            wait_seconds = None
+            if timeout:
+                first_started = min(started for _, started, _ in running.values())
+                wait_seconds = max(0.0, first_started + timeout - time.monotonic())
+            done, _ = wait(running, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+            for future in done:
+                ticker, started, slot = running.pop(future)
+                try:
+                    results[ticker] = future.result()
+                except Exception as error:
+                    # The worker itself died (e.g. killed by the OS): replace its slot
+                    message = "".join(traceback.format_exception_only(type(error), error)).strip()
+                    results[ticker] = (ticker, None, "failed", message, time.monotonic() - started)
+                    terminate(slot)
+                    slot = new_pool(1)
+                idle.append(slot)
+
+            now = time.monotonic()
+            for future, (ticker, started, slot) in list(running.items()):
+                if timeout and now - started >= timeout and not future.done():
+                    del running[future]
+                    terminate(slot)
+                    results[ticker] = (ticker, None, "timeout", f"exceeded {timeout:g}s", now - started)
+                    idle.append(new_pool(1))
+    finally:
+        for slot in idle:
+            slot.shutdown()
+        for _, _, slot in running.values():
+            terminate(slot)
+
+    forecasts, report = [], []
+    for ticker in tickers:
+        ticker, forecast, status, error, seconds = results[ticker]
+        report.append({"Ticker": ticker, "Status": status, "Seconds": round(seconds, 3), "Error": error})
+        if forecast is not None:
+            forecast = forecast.rename_axis("Date").reset_index()
+            forecast.insert(0, "Ticker", ticker)
+            forecasts.append(forecast)
+
+    if forecasts:
+        forecasts = pd.concat(forecasts, ignore_index=True)
+    else:
+        forecasts = pd.DataFrame(columns=["Ticker", "Date", "Close"])
+    return forecasts, pd.DataFrame(report)
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Forecast the next 30 days for a list of tickers.")
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols")
+    parser.add_argument("--file", help="Text file with one ticker per line")
+    parser.add_argument("--period", default="2y", help="Data period (default: 2y)")
+    parser.add_argument("--criterion", default="aic", choices=["aic", "bic"])
+    parser.add_argument("--order", help="Fixed p,q order instead of searching (e.g. 2,2)")
+    parser.add_argument("--timeout", type=float, default=BATCH_TASK_TIMEOUT_SECONDS,
+                        help="Per-ticker time limit in seconds (0 disables it)")
+    parser.add_argument("--out", default="forecasts.parquet", help="Output Parquet file")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.file:
+        with open(args.file) as f:
+            tickers += f.read().split()
+    if not tickers:
+        parser.error("no tickers given")
+    order = tuple(int(x) for x in args.order.split(",")) if args.order else None
+
+    started = time.perf_counter()
+    forecasts, report = run_batch(tickers, args.period, args.criterion, order, args.timeout)
+    forecasts.to_parquet(args.out, index=False)
+    report_path = os.path.splitext(args.out)[0] + "_report.csv"
+    report.to_csv(report_path, index=False)
+
+    print(report.to_string(index=False))
+    print(f"\n{(report['Status'] == 'ok').sum()}/{len(report)} tickers forecast in "
+          f"{time.perf_counter() - started:.1f}s -> {args.out} (report: {report_path})")
+    return 0 if (report["Status"] == "ok").all() else 1
+
+
+if __name__ == "__main__":
+    # Run through the package module so pool tasks pickle as pages.utils.batch.*
+    # rather than __main__.*, which workers do not import
+    from pages.utils import batch
+    sys.exit(batch.main())
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+from pages.utils.config import MARKET_INDEX, RISK_FREE_RATE, TRADING_DAYS, FETCH_TIMEOUT_SECONDS
+from pages.utils.data_store import load_history
+from pages.utils.model_cache import ModelCache, fingerprint
+from pages.utils.page_loader import submit, wait
+
+
+# Results per (ticker set, index, date range, settings, data fingerprint)
+_results = ModelCache(maxsize=64, name="capm")
+
+
+# --- Data ---
+def load_closes(tickers, start=None, market=MARKET_INDEX, timeout=FETCH_TIMEOUT_SECONDS):
+    """
+    Load close prices for many tickers and the market index concurrently.
+
+    Args:
+        tickers (list[str]): Ticker symbols.
+        start (pd.Timestamp, optional): First date, None for the full history.
+        market (str): Market index symbol.
+        timeout (float): Per-request timeout in seconds.
+
+    Returns:
+        tuple[pd.DataFrame, dict]: Close prices (one column per symbol, market
+            included, outer-joined on date) and {symbol: reason} for symbols that failed.
+    """
+    symbols = list(dict.fromkeys([market] + [t.upper() for t in tickers]))
+    requests = {symbol: submit("fetch_history", load_history, symbol, start=start) for symbol in symbols}
+
+    closes, failed = {}, {}
+    for symbol, request in requests.items():
+        history, error = wait(request, timeout)
+        if error is None and history.empty:
+            error = "no data"
+        if error is not None:
+            failed[symbol] = error
+            continue
+        closes[symbol] = history['Close']
+    return pd.DataFrame(closes), failed
+
+
+def returns_matrix(closes):
+    """
+    Daily simple returns of every symbol on the outer-joined calendar.
+
+    A symbol's return is NaN on days it did not trade (and the day after), so
+    each ticker keeps its own dates instead of being cut down to the dates
+    every symbol traded.
+
+    Args:
+        closes (pd.DataFrame): Close prices, one column per symbol.
+
+    Returns:
+        pd.DataFrame: Returns (rows where no symbol has a return dropped).
+    """
+    return closes.pct_change(fill_method=None).iloc[1:].dropna(how="all")
+
+
+def _pairs(returns, market):
+    # Values with missing pairs zeroed, and the mask of dates where both the ticker and the market traded
+    x = market.to_numpy(dtype=float)
+    y = returns.to_numpy(dtype=float)
+    mask = np.isfinite(y) & np.isfinite(x)[:, None]
+    return np.where(mask, x[:, None], 0.0), np.where(mask, y, 0.0), mask.astype(float)
+
+
+# --- CAPM ---
+def capm(returns, market, risk_free_rate=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """
+    Beta, alpha and CAPM expected return of every column of `returns` at once.
+
+    Each ticker is regressed on the dates where both it and the market have a
+    return (pairwise-complete), so a short or gappy history does not shrink the
+    sample of the others. Masked column sums give every covariance in one pass;
+    the estimates equal a per-ticker OLS regression of excess returns on market
+    excess returns.
+
+    Args:
+        returns (pd.DataFrame): Daily returns, one column per ticker (NaN where missing).
+        market (pd.Series): Market daily returns on the same dates.
+        risk_free_rate (float): Annual risk-free rate.
+        periods (int): Return periods per year.
+
+    Returns:
+        pd.DataFrame: Beta, Alpha (annual), Expected Return (annual), Annual Return,
+            R2 and Observations per ticker.
+    """
+    rf = risk_free_rate / periods
+    x, y, mask = _pairs(returns - rf, market - rf)
+
+    n = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean, y_mean = x.sum(axis=0) / n, y.sum(axis=0) / n
+        xc, yc = (x - x_mean) * mask, (y - y_mean) * mask
+        var_x = np.einsum("ij,ij->j", xc, xc)
+        cov_xy = np.einsum("ij,ij->j", xc, yc)
+        beta = cov_xy / var_x
+        alpha = y_mean - beta * x_mean
+        r2 = cov_xy ** 2 / (var_x * np.einsum("ij,ij->j", yc, yc))
+
+    market_premium = market.mean() * periods - risk_free_rate
+    return pd.DataFrame({
+        "Beta": beta,
+        "Alpha": alpha * periods,
+        "Expected Return": risk_free_rate + beta * market_premium,
+        "Annual Return": returns.mean().to_numpy() * periods,
+        "R2": r2,
+        "Observations": n.astype(int)
+    }, index=returns.columns)
+
+
+def rolling_beta(returns, market, window=60, min_periods=None):
+    """
+    Rolling-window beta of every column against the market from cumulative sums:
+    each window's sums are differences of two prefix sums, so the cost is
+    O(rows x tickers) whatever the window length. Only dates where both the
+    ticker and the market have a return count towards a window.
+
+    Args:
+        returns (pd.DataFrame): Daily returns, one column per ticker (NaN where missing).
+        market (pd.Series): Market daily returns on the same dates.
+        window (int): Window length in rows.
+        min_periods (int, optional): Paired observations a window needs, defaults to half the window.
+
+    Returns:
+        pd.DataFrame: Beta per ticker for each window end (NaN for the first window - 1
+            rows and for windows with fewer than min_periods pairs).
+    """
+    min_periods = max(2, window // 2 if min_periods is None else min_periods)
+    x, y, mask = _pairs(returns, market)
+    # Centre first so the prefix-sum differences do not lose precision
+    n_total = np.maximum(mask.sum(axis=0), 1)
+    x = (x - x.sum(axis=0) / n_total) * mask
+    y = (y - y.sum(axis=0) / n_total) * mask
+
+    def window_sums(values):
+        csum = np.cumsum(values, axis=0)
+        csum = np.concatenate([np.zeros((1,) + values.shape[1:]), csum])
+        return csum[window:] - csum[:-window]
+
+    n = window_sums(mask)
+    sx = window_sums(x)
+    sxx = window_sums(x * x)
+    sy = window_sums(y)
+    sxy = window_sums(x * y)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / n
+        var = sxx - sx * sx / n
+        window_betas = np.where(n >= min_periods, cov / var, np.nan)
+    betas = np.full(y.shape, np.nan)
+    betas[window - 1:] = window_betas
+    return pd.DataFrame(betas, index=returns.index, columns=returns.columns)
+
+
+# --- Cached entry point ---
+def analyze(closes, market=MARKET_INDEX, risk_free_rate=RISK_FREE_RATE, window=60):
+    """
+    CAPM statistics and rolling betas for every ticker in a close-price frame, cached
+    per ticker set, date range, settings and price data.
+
+    Args:
+        closes (pd.DataFrame): Close prices including the market column (see load_closes).
+        market (str): Market index column.
+        risk_free_rate (float): Annual risk-free rate.
+        window (int): Rolling beta window in trading days.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: CAPM table (see capm) and rolling betas (see rolling_beta).
+    """
+    returns = returns_matrix(closes)
+    returns = returns[returns[market].notna()]
+    tickers = [c for c in returns.columns if c != market]
+    key = (tuple(sorted(tickers)), market, str(returns.index[0]) if len(returns) else None,
+           str(returns.index[-1]) if len(returns) else None, risk_free_rate, window,
+           fingerprint(returns[sorted(tickers) + [market]]))
+    result = _results.get(key)
+    if result is None:
+        result = (
+            capm(returns[tickers], returns[market], risk_free_rate),
+            rolling_beta(returns[tickers], returns[market], window)
+        )
+        _results.put(key, result)
+    return result
@@ -0,0 +1,167 @@
+import os
+import json
+import glob
+import time
+import fcntl
+import shutil
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from pages.utils.config import HISTORY_DTYPE, HISTORY_MMAP
+
+
+# Columns the app actually uses. Dividends and Stock Splits are not stored: the data store
+# only checks them on fetch to detect re-adjusted prices (see data_store._fetch)
+CHART_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Superseded versions are removed only once older than this, so a reader in another process
+# that read the pointer just before a swap still finds the directory it points to
+STALE_VERSION_SECONDS = 60
+
+
+@contextmanager
+def _locked(base_path):
+    # Per-ticker lock file shared by every process writing the store
+    with open(f"{base_path}.lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _read_pointer(base_path):
+    try:
+        with open(f"{base_path}.current") as f:
+            return f"{base_path}.{f.read().strip()}"
+    except OSError:
+        return None
+
+
+class CompactHistory:
+    """
+    Column-pruned price history: int64 epoch-nanosecond dates plus one 1D array
+    per column, saved as .npy files that can be memory-mapped read-only.
+
+    Args:
+        dates (np.ndarray): int64 nanoseconds since the epoch, ascending.
+        columns (dict[str, np.ndarray]): Column name -> values, same length as dates.
+    """
+
+    def __init__(self, dates, columns):
+        self.dates = dates
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def nbytes(self):
+        return self.dates.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    @classmethod
+    def from_frame(cls, history, dtype=HISTORY_DTYPE):
+        """
+        Build a compact history from a Date-indexed OHLCV frame.
+
+        Args:
+            history (pd.DataFrame): Bars indexed by a tz-naive 'Date'.
+            dtype (str): Value dtype for the price columns ("float64" or "float32").
+
+        Returns:
+            CompactHistory: Pruned copy of the frame.
+        """
+        dates = np.ascontiguousarray(history.index.values.astype("datetime64[ns]").view("int64"))
+        columns = {}
+        for name in CHART_COLUMNS:
+            if name in history.columns:
+                column_dtype = "int64" if name == "Volume" else dtype
+                columns[name] = np.ascontiguousarray(history[name].to_numpy(dtype=column_dtype, na_value=0))
+        return cls(dates, columns)
+
+    def to_frame(self):
+        """
+        Wrap the arrays in a Date-indexed DataFrame without copying them.
+
+        Returns:
+            pd.DataFrame: Bars indexed by 'Date'; memory-mapped columns stay read-only.
+        """
+        index = pd.DatetimeIndex(self.dates.view("datetime64[ns]"), copy=False, name="Date")
+        return pd.DataFrame(self.columns, index=index, copy=False)
+
+    # --- On-disk layout ---
+    # base.current names the live directory base.<token>/ holding dates.npy and one .npy
+    # per column. Writers fill a new directory and swap the pointer under a per-ticker
+    # file lock, so readers never see a partial write and existing memory maps stay valid
+    # after the swap. The previous version is kept, older ones only after STALE_VERSION_SECONDS.
+    def save(self, base_path):
+        """
+        Write the arrays under base_path and make them the current version.
+
+        Safe to call from several processes at once: writers are serialized by a
+        lock file next to the pointer.
+
+        Args:
+            base_path (str): Path prefix (e.g., ".../history/AAPL.compact").
+        """
+        token = uuid.uuid4().hex
+        directory = f"{base_path}.{token}"
+        with _locked(base_path):
+            previous = _read_pointer(base_path)
+            os.makedirs(directory)
+            np.save(os.path.join(directory, "dates.npy"), self.dates)
+            for name, values in self.columns.items():
+                np.save(os.path.join(directory, f"{name}.npy"), values)
+            with open(os.path.join(directory, "columns.json"), "w") as f:
+                json.dump(list(self.columns), f)
+
+            tmp_path = f"{base_path}.current.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(token)
+            os.replace(tmp_path, f"{base_path}.current")
+
+            now = time.time()
+            for old in glob.glob(f"{glob.escape(base_path)}.*"):
+                if old in (directory, previous) or not os.path.isdir(old):
+                    continue
+                try:
+                    stale = now - os.path.getmtime(old) > STALE_VERSION_SECONDS
+                except OSError:
+                    continue
+                if stale:
+                    shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, base_path, mmap=HISTORY_MMAP):
+        """
+        Load the current version saved under base_path.
+
+        Args:
+            base_path (str): Path prefix used with save.
+            mmap (bool): Memory-map the arrays read-only instead of reading them into memory.
+
+        Returns:
+            CompactHistory or None: Stored history, or None if nothing (complete) is stored.
+        """
+        mode = "r" if mmap else None
+        directory = _read_pointer(base_path)
+        for attempt in range(2):
+            if directory is None:
+                return None
+            try:
+                with open(os.path.join(directory, "columns.json")) as f:
+                    names = json.load(f)
+                dates = np.load(os.path.join(directory, "dates.npy"), mmap_mode=mode)
+                columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+                           for name in names}
+                return cls(dates, columns)
+            except (OSError, ValueError):
+                # Swapped out and removed after the pointer was read: follow the new pointer once
+                current = _read_pointer(base_path)
+                if current == directory:
+                    return None
+                directory = current
+        return None
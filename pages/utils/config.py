@@ -0,0 +1,135 @@
+import os
+
+
+# --- Local storage ---
+# Root directory for everything the app persists between runs (price history, caches).
+DATA_DIR = os.environ.get(
+    "STOCK_DATA_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".stock_data"))
+)
+
+# --- Price history store ---
+# How long (seconds) a stored history is trusted before asking upstream for new bars.
+HISTORY_REFRESH_SECONDS = int(os.environ.get("STOCK_HISTORY_REFRESH_SECONDS", 15 * 60))
+
+# --- Company fundamentals cache ---
+# Ticker.info changes at most daily, so entries are trusted for a day by default.
+FUNDAMENTALS_TTL_SECONDS = int(os.environ.get("STOCK_FUNDAMENTALS_TTL_SECONDS", 24 * 60 * 60))
+FUNDAMENTALS_CACHE_SIZE = int(os.environ.get("STOCK_FUNDAMENTALS_CACHE_SIZE", 256))
+# Set to "0" to keep fundamentals in memory only
+FUNDAMENTALS_PERSIST = os.environ.get("STOCK_FUNDAMENTALS_PERSIST", "1") != "0"
+
+# --- Fitted model cache ---
+MODEL_CACHE_SIZE = int(os.environ.get("STOCK_MODEL_CACHE_SIZE", 32))
+# Set to "1" to also pickle fitted models to disk so they survive restarts
+MODEL_CACHE_PERSIST = os.environ.get("STOCK_MODEL_CACHE_PERSIST", "0") == "1"
+
+# --- Incremental model updates ---
+# New bars a fitted ARIMA model absorbs (parameters kept, only the filter state extended)
+# before it is refitted from scratch
+MODEL_REFIT_BARS = int(os.environ.get("STOCK_MODEL_REFIT_BARS", 20))
+# Refit early when the RMS of the new bars' standardized one-step errors exceeds this
+MODEL_DRIFT_Z = float(os.environ.get("STOCK_MODEL_DRIFT_Z", 3.0))
+# Refit the scaler when the scaled window's mean (or std) moves further than this from 0 (or 1)
+SCALER_DRIFT = float(os.environ.get("STOCK_SCALER_DRIFT", 0.25))
+
+# --- ARIMA order search ---
+# Wall-clock budget (seconds) for one (p, q) grid search
+ORDER_SEARCH_BUDGET_SECONDS = float(os.environ.get("STOCK_ORDER_SEARCH_BUDGET_SECONDS", 10))
+# Days a remembered order (per ticker, period and criterion) is reused before searching again
+ORDER_MAX_AGE_DAYS = float(os.environ.get("STOCK_ORDER_MAX_AGE_DAYS", 7))
+
+# --- Forecast engines ---
+# Engine preselected on the prediction page; a fast NumPy engine so the first forecast is instant
+# (ARIMA stays available further down the list)
+DEFAULT_ENGINE = os.environ.get("STOCK_DEFAULT_ENGINE", "holt")
+
+# --- Model worker processes ---
+# Size of the process pool shared by the order search and the backtests, defaults to every core
+MODEL_WORKERS = int(os.environ.get("STOCK_MODEL_WORKERS", os.cpu_count() or 1))
+
+# --- Batch forecasting ---
+# Per-ticker wall-clock limit (seconds) for batch forecasts
+BATCH_TASK_TIMEOUT_SECONDS = float(os.environ.get("STOCK_BATCH_TASK_TIMEOUT_SECONDS", 300))
+
+# --- Precomputed artifacts ---
+# Tickers covering most traffic; refreshed by the after-close scheduler
+POPULAR_TICKERS = ["TSLA", "AAPL", "MSFT", "GOOGL", "AMZN", "NFLX", "META", "NVDA", "IBM", "ORCL"]
+# Period options offered on the prediction page
+PREDICTION_PERIODS = ["6mo", "1y", "2y", "5y", "10y", "ytd", "max"]
+# Set to "1" to run the after-close scheduler inside the Streamlit process
+PRECOMPUTE_ENABLED = os.environ.get("STOCK_PRECOMPUTE", "0") == "1"
+# Minutes after the close before the scheduler runs, giving upstream time to publish the final bar
+PRECOMPUTE_DELAY_MINUTES = int(os.environ.get("STOCK_PRECOMPUTE_DELAY_MINUTES", 30))
+# Worker processes of the scheduler's own pool, kept small so interactive fits are not queued behind it
+PRECOMPUTE_WORKERS = int(os.environ.get("STOCK_PRECOMPUTE_WORKERS", max(1, (os.cpu_count() or 1) // 4)))
+
+# --- Stationarity ---
+# Highest differencing order considered; ARIMA rarely needs more than d=2
+MAX_DIFFERENCING_ORDER = int(os.environ.get("STOCK_MAX_DIFFERENCING_ORDER", 2))
+# "adf" (ADF only) or "adf_kpss" (ADF rejects a unit root and KPSS does not reject stationarity)
+STATIONARITY_METHOD = os.environ.get("STOCK_STATIONARITY_METHOD", "adf")
+
+# --- Charts ---
+# Point budget per chart trace; longer series are downsampled before plotting
+MAX_CHART_POINTS = int(os.environ.get("STOCK_MAX_CHART_POINTS", 1500))
+
+# --- Figure cache ---
+# Memory budget (MB) for serialized Plotly figures shared across sessions
+FIGURE_CACHE_MB = float(os.environ.get("STOCK_FIGURE_CACHE_MB", 64))
+
+# --- Startup ---
+# Import statsmodels/sklearn/scipy/yfinance in the background once the landing page has rendered
+WARM_IMPORTS = os.environ.get("STOCK_WARM_IMPORTS", "1") == "1"
+# Show each page's render time under the page (always logged)
+SHOW_RENDER_TIMES = os.environ.get("STOCK_SHOW_RENDER_TIMES", "0") == "1"
+
+# --- Metrics ---
+# Write metrics after every page run: *.prom for Prometheus text format, anything else as JSON
+METRICS_FILE = os.environ.get("STOCK_METRICS_FILE")
+# Show the per-stage timings of the current rerun in an expander at the bottom of each page
+DEBUG_PANEL = os.environ.get("STOCK_DEBUG_PANEL", "0") == "1"
+
+# --- Market data provider ---
+# "yfinance" (live) or "replay" (files recorded under REPLAY_DIR, no network)
+PROVIDER = os.environ.get("STOCK_PROVIDER", "yfinance")
+REPLAY_DIR = os.environ.get("STOCK_REPLAY_DIR", os.path.join(DATA_DIR, "replay"))
+# Simulated upstream latency of the replay provider, for load testing
+REPLAY_LATENCY_MS = float(os.environ.get("STOCK_REPLAY_LATENCY_MS", 0))
+# Upstream request budget per process: sustained requests/second and burst size
+UPSTREAM_RATE = float(os.environ.get("STOCK_UPSTREAM_RATE", 2))
+UPSTREAM_BURST = int(os.environ.get("STOCK_UPSTREAM_BURST", 5))
+# Retries (with exponential backoff from UPSTREAM_BACKOFF_SECONDS) on rate limits and network errors
+UPSTREAM_RETRIES = int(os.environ.get("STOCK_UPSTREAM_RETRIES", 3))
+UPSTREAM_BACKOFF_SECONDS = float(os.environ.get("STOCK_UPSTREAM_BACKOFF_SECONDS", 1.0))
+
+# --- Page data loading ---
+# Market index fetched alongside each analysis page for comparison
+MARKET_INDEX = os.environ.get("STOCK_MARKET_INDEX", "^GSPC")
+# Threads shared by all sessions for concurrent page fetches, and the per-request timeout
+PAGE_FETCH_THREADS = int(os.environ.get("STOCK_PAGE_FETCH_THREADS", 16))
+FETCH_TIMEOUT_SECONDS = float(os.environ.get("STOCK_FETCH_TIMEOUT_SECONDS", 15))
+
+# --- CAPM ---
+# Annual risk-free rate used for alpha and expected return
+RISK_FREE_RATE = float(os.environ.get("STOCK_RISK_FREE_RATE", 0.04))
+TRADING_DAYS = 252
+
+# --- History storage ---
+# Value dtype of the compact on-disk history ("float64" or "float32" to halve memory)
+HISTORY_DTYPE = os.environ.get("STOCK_HISTORY_DTYPE", "float64")
+# Memory-map compact histories so concurrent sessions share the OS page cache
+HISTORY_MMAP = os.environ.get("STOCK_HISTORY_MMAP", "1") == "1"
+
+# --- Analysis service ---
+# Base URL of a running `python -m pages.utils.service`; when set, the prediction page
+# submits forecast jobs to it instead of fitting inline
+SERVICE_URL = os.environ.get("STOCK_SERVICE_URL")
+SERVICE_HOST = os.environ.get("STOCK_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("STOCK_SERVICE_PORT", 8502))
+# Jobs queued or running at once; further submissions are refused with 503
+SERVICE_MAX_JOBS = int(os.environ.get("STOCK_SERVICE_MAX_JOBS", 64))
+# How long finished jobs are kept for polling (identical submissions reuse them meanwhile)
+SERVICE_JOB_TTL_SECONDS = float(os.environ.get("STOCK_SERVICE_JOB_TTL_SECONDS", 600))
+# Page poll interval while a job runs
+SERVICE_POLL_SECONDS = float(os.environ.get("STOCK_SERVICE_POLL_SECONDS", 1.0))
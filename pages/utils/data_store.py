@@ -0,0 +1,398 @@
+import os
+import copy
+import json
+import re
+import threading
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+import numpy as np
+import pandas as pd
+
+from pages.utils.config import DATA_DIR, HISTORY_REFRESH_SECONDS, PRECOMPUTE_DELAY_MINUTES
+from pages.utils.market_hours import MARKET_TZ, is_open, last_close
+from pages.utils.indicators import IndicatorState, INDICATOR_COLUMNS, compute_indicators, indicator_frame
+from pages.utils.metrics import cache_result, increment
+from pages.utils.providers import get_provider, check_ticker
+from pages.utils.single_flight import SingleFlight
+from pages.utils.compact import CHART_COLUMNS, CompactHistory
+
+
+HISTORY_DIR = os.path.join(DATA_DIR, "history")
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+# Relative Close difference on a re-fetched bar that means upstream re-adjusted its history
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# Concurrent sessions asking for the same ticker share one store read/top-up
+_history_flights = SingleFlight("history")
+_indicator_flights = SingleFlight("indicators")
+
+
+# --- Paths & locking ---
+def _history_path(ticker):
+    # Legacy full-frame store, only read to migrate to the compact layout
+    return os.path.join(HISTORY_DIR, f"{ticker}.parquet")
+
+
+def _compact_path(ticker):
+    return os.path.join(HISTORY_DIR, f"{ticker}.compact")
+
+
+def _meta_path(ticker):
+    return os.path.join(HISTORY_DIR, f"{ticker}.json")
+
+
+def _indicators_path(ticker):
+    return os.path.join(HISTORY_DIR, f"{ticker}.indicators.parquet")
+
+
+def _state_path(ticker):
+    return os.path.join(HISTORY_DIR, f"{ticker}.state.json")
+
+
+def _lock_for(ticker):
+    with _locks_guard:
+        return _locks.setdefault(ticker, threading.Lock())
+
+
+# --- Reading & writing the store ---
+def read_history(ticker):
+    """
+    Read the stored price history for a ticker without touching the network.
+
+    Args:
+        ticker (str): Stock ticker symbol (e.g., "AAPL").
+
+    Histories are kept as CompactHistory arrays and memory-mapped (HISTORY_MMAP),
+    so sessions reading the same ticker share one copy in the OS page cache.
+
+    Returns:
+        pd.DataFrame or None: OHLCV bars indexed by a tz-naive 'Date' (read-only when
+            memory-mapped), or None if nothing is stored.
+
+    Raises:
+        ValueError: If ticker is not a valid symbol (see providers.check_ticker).
+    """
+    ticker = check_ticker(ticker)
+    compact = CompactHistory.load(_compact_path(ticker))
+    if compact is None:
+        if not os.path.exists(_history_path(ticker)):
+            return None
+        compact = CompactHistory.from_frame(_normalise(pd.read_parquet(_history_path(ticker))))
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        compact.save(_compact_path(ticker))
+        os.remove(_history_path(ticker))
+    return compact.to_frame()
+
+
+def _read_meta(ticker):
+    try:
+        with open(_meta_path(ticker)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(ticker, history, meta):
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    # Saved as a new version and swapped in, so readers never see a half-written history
+    CompactHistory.from_frame(history).save(_compact_path(ticker))
+
+    _write_json(_meta_path(ticker), meta)
+
+
+def _write_json(path, payload):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def _is_stale(meta):
+    checked_at = meta.get("checked_at")
+    if checked_at is None:
+        return True
+    checked_at = datetime.fromisoformat(checked_at)
+    # Nothing new can arrive between a post-close check (once the final bar has
+    # had time to settle) and the next open
+    settled = last_close() + timedelta(minutes=PRECOMPUTE_DELAY_MINUTES)
+    if not is_open() and checked_at.astimezone(MARKET_TZ) >= settled:
+        return False
+    age = datetime.now() - checked_at
+    return age.total_seconds() > HISTORY_REFRESH_SECONDS
+
+
+def _covers(meta, start):
+    # A missing 'covers_from' means the stored history goes back to the first listed bar
+    covers_from = meta.get("covers_from")
+    if covers_from is None:
+        return True
+    if start is None:
+        return False
+    return pd.Timestamp(covers_from) <= start
+
+
+# --- Upstream fetch ---
+def _fetch(ticker, start=None, end=None):
+    # Also returns the dates of any dividend or split, which _normalise drops
+    history = get_provider().history(ticker, start=start, end=end)
+    return _normalise(history), _action_dates(history)
+
+
+def _action_dates(history):
+    # Upstream prices are split- and dividend-adjusted: every bar before one of these dates is rescaled
+    columns = [c for c in ("Dividends", "Stock Splits") if c in history.columns]
+    if history.empty or not columns:
+        return pd.DatetimeIndex([])
+    dates = history.index[(history[columns].fillna(0) != 0).any(axis=1)]
+    return dates.tz_localize(None) if dates.tz is not None else dates
+
+
+def _matches(stored, fetched):
+    # Bars present in both must agree, otherwise the stored bars are on an old price scale
+    common = stored.index.intersection(fetched.index)
+    if common.empty:
+        return True
+    return np.allclose(stored.loc[common, "Close"], fetched.loc[common, "Close"], rtol=ADJUSTMENT_TOLERANCE)
+
+
+def _normalise(history):
+    if history.empty:
+        return history
+    # Only the charted columns are kept (no Dividends / Stock Splits)
+    history = history.dropna(subset=["Close"])[[c for c in CHART_COLUMNS if c in history.columns]]
+    # Remove timezone so stored dates compare cleanly with naive datetimes
+    if history.index.tz is not None:
+        history.index = history.index.tz_localize(None)
+    history.index.name = "Date"
+    return history
+
+
+# --- Public API ---
+def load_history(ticker, start=None):
+    """
+    Return the daily price history for a ticker, topping up the local store first.
+
+    The store only ever downloads what it is missing: bars older than the stored
+    range when an earlier start is requested, and bars from the last stored date
+    onwards once the store is older than HISTORY_REFRESH_SECONDS. Upstream prices are
+    split- and dividend-adjusted, so when a new split or dividend appears or a
+    re-fetched bar no longer matches the store, the whole stored range is fetched
+    again instead of appending bars on a different price scale.
+
+    Args:
+        ticker (str): Stock ticker symbol (e.g., "AAPL").
+        start (pd.Timestamp, optional): First date needed. None means the full history.
+
+    Returns:
+        pd.DataFrame: OHLCV bars from start onwards, indexed by a tz-naive 'Date'
+            (empty if the ticker is unknown).
+
+    Raises:
+        ValueError: If ticker is not a valid symbol (see providers.check_ticker).
+    """
+    ticker = check_ticker(ticker)
+    return _history_flights.do((ticker, start), lambda: _load_history(ticker, start))
+
+
+def _load_history(ticker, start):
+    with _lock_for(ticker):
+        stored = read_history(ticker)
+        meta = _read_meta(ticker)
+
+        if stored is None or stored.empty:
+            cache_result("history", False)
+            history, _ = _fetch(ticker, start=start)
+            covers_from = start
+            checked_at = datetime.now().isoformat()
+        else:
+            history = stored
+            covers_from = meta.get("covers_from")
+            checked_at = meta.get("checked_at")
+            up_to_date = not _is_stale(meta)
+
+            covered = _covers(meta, start)
+            cache_result("history", covered and up_to_date)
+            if covered and up_to_date:
+                return _from(history, start)
+
+            rescaled = False
+            if not covered:
+                # Fetched through the first stored bar, so the overlap can be compared
+                older, _ = _fetch(ticker, start=start, end=stored.index[0] + timedelta(days=1))
+                rescaled = not _matches(stored, older)
+                history = pd.concat([older[older.index < stored.index[0]], history])
+                covers_from = start
+
+            if not up_to_date:
+                # Re-fetch the last stored bar, it may have been a partial (intraday) bar,
+                # and the complete bar before it to compare against the store
+                anchor = stored.index[max(len(stored) - 2, 0)]
+                fresh, actions = _fetch(ticker, start=anchor)
+                rescaled = rescaled or (actions > anchor).any() or not _matches(stored.iloc[:-1], fresh)
+                if not fresh.empty:
+                    history = pd.concat([history[history.index < fresh.index[0]], fresh])
+                checked_at = datetime.now().isoformat()
+
+            if rescaled:
+                # A split or dividend re-adjusted the upstream prices: replace the whole stored
+                # range rather than appending bars on a different scale
+                increment("history_refetches_total", reason="adjusted")
+                history, _ = _fetch(ticker, start=pd.Timestamp(covers_from) if covers_from else None)
+                _drop_indicators(ticker)
+
+        if history.empty:
+            return history
+
+        if isinstance(covers_from, pd.Timestamp):
+            covers_from = covers_from.isoformat()
+        _write(ticker, history, {
+            "checked_at": checked_at,
+            "covers_from": covers_from
+        })
+        return _from(history, start)
+
+
+def _from(history, start):
+    # Dates are sorted: binary search gives a zero-copy view instead of a masked copy
+    if start is None:
+        return history
+    return history.iloc[history.index.searchsorted(pd.Timestamp(start)):]
+
+
+def period_start(last_date, period):
+    """
+    Compute the first date covered by a yfinance-style period string.
+
+    Args:
+        last_date (pd.Timestamp): Date of the most recent bar.
+        period (str): Period string (e.g., "5d", "1mo", "6mo", "1y", "ytd", "max").
+
+    Returns:
+        pd.Timestamp or None: Start date of the period, or None for "max".
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(last_date.year, 1, 1)
+
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if match is None:
+        raise ValueError(f"Unsupported period: {period}")
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        delta = relativedelta(days=amount)
+    elif unit == "wk":
+        delta = relativedelta(weeks=amount)
+    elif unit == "mo":
+        delta = relativedelta(months=amount)
+    else:
+        delta = relativedelta(years=amount)
+    return last_date - delta
+
+
+def slice_period(history, period):
+    """
+    Cut a stored history down to a yfinance-style period.
+
+    Args:
+        history (pd.DataFrame): Price history indexed by 'Date'.
+        period (str): Period string (e.g., "6mo", "1y", "5y", "ytd", "max").
+
+    Returns:
+        pd.DataFrame: Rows of history that fall inside the period.
+    """
+    if history.empty:
+        return history
+    return _from(history, period_start(history.index[-1], period))
+
+
+# --- Stored indicators ---
+def _drop_indicators(ticker):
+    # Caller holds the ticker lock; the next load_indicators rebuilds from the new prices
+    for path in (_state_path(ticker), _indicators_path(ticker)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _read_indicator_state(ticker):
+    try:
+        with open(_state_path(ticker)) as f:
+            saved = json.load(f)
+        stored = pd.read_parquet(_indicators_path(ticker))
+    except (OSError, ValueError):
+        return None, None
+    return stored, saved
+
+
+def load_indicators(ticker, start=None):
+    """
+    Return chart indicators for the stored history, updating them incrementally.
+
+    Indicator rows and the streaming IndicatorState are saved next to the price
+    history. Only bars newer than the saved state are fed through it, so a
+    daily refresh costs O(new bars) instead of a pass over the full history.
+    The state is committed up to the second-to-last bar because the last bar
+    may still be replaced by the next top-up.
+
+    Args:
+        ticker (str): Stock ticker symbol (e.g., "AAPL").
+        start (pd.Timestamp, optional): First date to return. None returns every stored row.
+
+    Returns:
+        pd.DataFrame: Read-only indicator frame (see compute_indicators) indexed by 'Date'.
+    """
+    ticker = check_ticker(ticker)
+    return _indicator_flights.do((ticker, start), lambda: _load_indicators(ticker, start))
+
+
+def _load_indicators(ticker, start):
+    with _lock_for(ticker):
+        history = read_history(ticker)
+        if history is None or len(history) < 2:
+            return compute_indicators(history if history is not None else pd.DataFrame({"Close": []}))
+
+        stored, saved = _read_indicator_state(ticker)
+        close = history['Close']
+
+        usable = (
+            saved is not None
+            and pd.Timestamp(saved["first_date"]) == history.index[0]
+            and pd.Timestamp(saved["as_of"]) in history.index
+            and pd.Timestamp(saved["as_of"]) < history.index[-1]
+            and stored.index.equals(close.index[close.index <= pd.Timestamp(saved["as_of"])])
+        )
+        if usable:
+            as_of = pd.Timestamp(saved["as_of"])
+            state = IndicatorState.from_dict(saved["state"])
+            committed = stored.to_numpy()
+            pending = close[close.index > as_of]
+        else:
+            # Backfilled or missing: rebuild once from the whole stored history
+            state = IndicatorState()
+            committed = compute_indicators(history.iloc[:-1]).to_numpy()
+            for value in close.iloc[:-1]:
+                state.update(value)
+            pending = close.iloc[-1:]
+
+        new_rows = [state.update(value) for value in pending.iloc[:-1]]
+        tentative = copy.deepcopy(state).update(pending.iloc[-1])
+
+        if new_rows or not usable:
+            committed_index = close.index[:-1]
+            if new_rows:
+                committed = np.vstack([committed, new_rows])
+            pd.DataFrame(committed, index=committed_index, columns=INDICATOR_COLUMNS).to_parquet(
+                _indicators_path(ticker) + ".tmp")
+            os.replace(_indicators_path(ticker) + ".tmp", _indicators_path(ticker))
+            _write_json(_state_path(ticker), {
+                "first_date": history.index[0].isoformat(),
+                "as_of": committed_index[-1].isoformat(),
+                "state": state.to_dict()
+            })
+
+        indicators = indicator_frame(np.vstack([committed, [tentative]]), close.index)
+        return _from(indicators, start)
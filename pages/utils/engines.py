@@ -0,0 +1,205 @@
+import numpy as np
+
+
+# --- Registry ---
+ENGINES = {}
+
+
+def register(name, label):
+    """Class decorator adding a forecast engine to the registry under `name`."""
+    def decorator(cls):
+        cls.name = name
+        cls.label = label
+        ENGINES[name] = cls
+        return cls
+    return decorator
+
+
+def get_engine(name):
+    """
+    Create a fresh instance of a registered forecast engine.
+
+    Args:
+        name (str): Registry key (e.g., "arima", "holt").
+
+    Returns:
+        ForecastEngine: Unfitted engine.
+    """
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown forecast engine: {name}") from None
+
+
+class ForecastEngine:
+    """
+    Base class for forecast engines.
+
+    Engines are fitted on a 1D series with fit(data, differencing_order, order)
+    and return point forecasts from forecast(steps).
+    """
+
+    name = None
+    label = None
+
+    def fit(self, data, differencing_order, order=None):
+        raise NotImplementedError
+
+    def forecast(self, steps):
+        raise NotImplementedError
+
+
+def _as_array(data):
+    return np.asarray(data, dtype=float).ravel()
+
+
+# --- Engines ---
+@register("arima", "ARIMA (accurate, slow)")
+class ARIMAEngine(ForecastEngine):
+    """statsmodels ARIMA through the cached fit in models_trainer."""
+
+    def fit(self, data, differencing_order, order=None):
+        from pages.utils.models_trainer import get_fitted_model
+
+        self.model_fit = get_fitted_model(data, order or (30, differencing_order, 30))
+        return self
+
+    def forecast(self, steps):
+        return np.asarray(self.model_fit.forecast(steps=steps))
+
+
+@register("ar", "AR (least squares)")
+class AREngine(ForecastEngine):
+    """Autoregression on the d-times differenced series, lag order picked by AIC."""
+
+    max_lag = 20
+
+    def fit(self, data, differencing_order, order=None):
+        values = _as_array(data)
+        self.tails = [values]
+        for _ in range(differencing_order):
+            self.tails.append(np.diff(self.tails[-1]))
+        series = self.tails[-1]
+
+        max_lag = min(self.max_lag, len(series) // 3)
+        nobs = len(series) - max_lag
+        design = np.empty((nobs, max_lag + 1))
+        design[:, 0] = 1.0
+        for k in range(1, max_lag + 1):
+            design[:, k] = series[max_lag - k:max_lag - k + nobs]
+        target = series[max_lag:]
+
+        if order is not None:
+            lag = min(order[0], max_lag)
+        else:
+            # Residual sums of squares of every nested lag set from one QR factorisation
+            q, _ = np.linalg.qr(design)
+            ssr = target @ target - np.cumsum((q.T @ target) ** 2)
+            aic = nobs * np.log(np.maximum(ssr, 1e-300) / nobs) + 2 * np.arange(1, max_lag + 2)
+            lag = int(np.argmin(aic))
+
+        self.coef, _, _, _ = np.linalg.lstsq(design[:, :lag + 1], target, rcond=None)
+        self.lag = lag
+        return self
+
+    def forecast(self, steps):
+        history = list(self.tails[-1][-self.lag:]) if self.lag else []
+        predictions = np.empty(steps)
+        for h in range(steps):
+            value = self.coef[0] + sum(self.coef[k] * history[-k] for k in range(1, self.lag + 1))
+            predictions[h] = value
+            history.append(value)
+
+        # Integrate back through each differencing level
+        for level in reversed(self.tails[:-1]):
+            predictions = level[-1] + np.cumsum(predictions)
+        return predictions
+
+
+@register("holt", "Holt (linear trend)")
+class HoltEngine(ForecastEngine):
+    """Holt's linear trend method, smoothing parameters picked by a grid search on SSE."""
+
+    alphas = np.linspace(0.05, 1.0, 20)
+    betas = np.linspace(0.01, 0.5, 20)
+
+    def fit(self, data, differencing_order=None, order=None):
+        from scipy.signal import lfilter
+        values = _as_array(data)
+        # Holt is ARIMA(0, 2, 2): one-step errors come from one IIR filter per (alpha, beta),
+        # starting from level = y[1] and trend = y[1] - y[0]
+        second_diff = values[2:] - 2 * values[1:-1] + values[:-2]
+
+        best = None
+        for alpha in self.alphas:
+            for beta in self.betas:
+                theta1, theta2 = 2 - alpha - alpha * beta, alpha - 1
+                errors = lfilter([1.0], [1.0, -theta1, -theta2], second_diff)
+                sse = errors @ errors
+                if best is None or sse < best[0]:
+                    best = (sse, alpha, beta, errors)
+
+        _, alpha, beta, errors = best
+        self.level = values[-1] - (1 - alpha) * errors[-1]
+        self.trend = (values[1] - values[0]) + alpha * beta * errors.sum()
+        return self
+
+    def forecast(self, steps):
+        return self.level + self.trend * np.arange(1, steps + 1)
+
+
+@register("theta", "Theta")
+class ThetaEngine(ForecastEngine):
+    """Theta method: simple exponential smoothing plus half the linear-trend slope."""
+
+    alphas = np.linspace(0.02, 1.0, 50)
+
+    def fit(self, data, differencing_order=None, order=None):
+        from scipy.signal import lfilter
+        values = _as_array(data)
+        diffs = np.diff(values)
+
+        # SES one-step errors from an IIR filter per alpha, starting from level = y[0]
+        best = None
+        for alpha in self.alphas:
+            errors = lfilter([1.0], [1.0, alpha - 1.0], diffs)
+            sse = errors @ errors
+            if best is None or sse < best[0]:
+                best = (sse, alpha, errors)
+
+        _, self.alpha, errors = best
+        self.level = values[-1] - (1 - self.alpha) * errors[-1]
+        self.slope = np.polyfit(np.arange(len(values)), values, 1)[0]
+        self.n = len(values)
+        return self
+
+    def forecast(self, steps):
+        h = np.arange(1, steps + 1)
+        drift = (h - 1) + 1 / self.alpha - (1 - self.alpha) ** self.n / self.alpha
+        return self.level + self.slope / 2 * drift
+
+
+@register("naive", "Naive (last value)")
+class NaiveEngine(ForecastEngine):
+    """Repeats the last observed value."""
+
+    def fit(self, data, differencing_order=None, order=None):
+        self.last = _as_array(data)[-1]
+        return self
+
+    def forecast(self, steps):
+        return np.full(steps, self.last)
+
+
+@register("seasonal_naive", "Seasonal Naive (weekly)")
+class SeasonalNaiveEngine(ForecastEngine):
+    """Repeats the last season (5 trading days by default)."""
+
+    season = 5
+
+    def fit(self, data, differencing_order=None, order=None):
+        self.last_season = _as_array(data)[-self.season:]
+        return self
+
+    def forecast(self, steps):
+        return np.resize(self.last_season, steps)
@@ -0,0 +1,47 @@
+import math
+
+import pandas as pd
+
+from pages.utils.data_store import period_start
+
+
+# Bars each indicator needs before its first valid value
+INDICATOR_WARMUP = {
+    "RSI": 14,
+    "MACD": 35,            # 26-bar slow EMA + 9-bar signal line
+    "Moving Average": 50   # SMA 50
+}
+
+# Warm-up that covers every indicator the analysis page can draw
+MAX_WARMUP = max(INDICATOR_WARMUP.values())
+
+# Extra calendar days to absorb exchange holidays when converting bars to dates
+HOLIDAY_SLACK_DAYS = 10
+
+
+def bars_to_days(bars):
+    """Convert a number of trading bars into calendar days (5 trading days per week)."""
+    return math.ceil(bars * 7 / 5) + HOLIDAY_SLACK_DAYS
+
+
+def plan_start(num_period, warmup_bars=MAX_WARMUP, today=None):
+    """
+    Work out the earliest date that needs to be fetched for a sidebar period choice.
+
+    Args:
+        num_period (int or str): Row count (e.g., 10) or yfinance period (e.g., "6mo", "max").
+        warmup_bars (int): Look-back bars the indicators need before the period starts.
+        today (pd.Timestamp, optional): Reference date, defaults to today.
+
+    Returns:
+        pd.Timestamp or None: Start date to request, or None when the full history is needed.
+    """
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.today().normalize()
+
+    if isinstance(num_period, int):
+        return today - pd.Timedelta(days=bars_to_days(num_period + warmup_bars))
+
+    start = period_start(today, num_period)
+    if start is None:
+        return None
+    return start - pd.Timedelta(days=bars_to_days(warmup_bars))
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from pages.utils.config import FIGURE_CACHE_MB
+from pages.utils.metrics import cache_result, span
+
+
+def data_version(history):
+    """
+    Cheap version tag for a price history: changes whenever bars are added,
+    backfilled or the last (possibly intraday) bar is replaced.
+
+    Args:
+        history (pd.DataFrame): Price history with 'Date' and 'Close' columns.
+
+    Returns:
+        tuple: (row count, first date, last date, last close).
+    """
+    if history.empty:
+        return (0,)
+    dates = history['Date']
+    return (len(history), str(dates.iloc[0]), str(dates.iloc[-1]), float(history['Close'].iloc[-1]))
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of serialized Plotly figures, bounded by total payload size.
+
+    Args:
+        max_bytes (int): Maximum total size of the stored JSON payloads.
+    """
+
+    def __init__(self, max_bytes=int(FIGURE_CACHE_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_json(self, key):
+        """Return the cached figure JSON for key, or None."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+        cache_result("figures", payload is not None)
+        return payload
+
+    def put_json(self, key, payload):
+        """Store a figure JSON payload under key, evicting the least recently used ones."""
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self.size += len(payload)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        """Drop every cached figure."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def figure(self, key, build):
+        """
+        Return the figure for key, building and caching it on a miss.
+
+        Args:
+            key (tuple): Cache key, e.g. (ticker, period, chart type, indicator, data version).
+            build (callable): Zero-argument function returning a go.Figure.
+
+        Returns:
+            go.Figure: Cached or freshly built figure.
+        """
+        payload = self.get_json(key)
+        if payload is not None:
+            with span("figure.restore"):
+                return pio.from_json(payload, skip_invalid=True)
+        with span("figure.build"):
+            fig = build()
+        with span("figure.serialize"):
+            payload = fig.to_json()
+        self.put_json(key, payload)
+        return fig
+
+
+figures = FigureCache()
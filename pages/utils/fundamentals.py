@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+from pages.utils.config import (
+    DATA_DIR,
+    FUNDAMENTALS_TTL_SECONDS,
+    FUNDAMENTALS_CACHE_SIZE,
+    FUNDAMENTALS_PERSIST
+)
+from pages.utils.metrics import cache_result
+from pages.utils.providers import get_provider, check_ticker
+from pages.utils.single_flight import SingleFlight
+
+
+class FundamentalsCache:
+    """
+    Process-wide TTL + LRU cache for company fundamentals (yfinance Ticker.info).
+
+    Entries live in memory for every Streamlit session of the process and can
+    optionally be persisted as one JSON file per ticker so they survive restarts.
+
+    Args:
+        ttl (int): Seconds an entry stays valid.
+        maxsize (int): Maximum number of tickers kept in memory.
+        persist_dir (str, optional): Directory for the on-disk layer, None to disable it.
+    """
+
+    def __init__(self, ttl=FUNDAMENTALS_TTL_SECONDS, maxsize=FUNDAMENTALS_CACHE_SIZE, persist_dir=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.persist_dir = persist_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._preloading = set()
+        self._flights = SingleFlight("fundamentals")
+
+    # --- In-memory layer ---
+    def _lookup(self, ticker):
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None:
+                return None
+            fetched_at, info = entry
+            if time.time() - fetched_at > self.ttl:
+                del self._entries[ticker]
+                return None
+            self._entries.move_to_end(ticker)
+            return info
+
+    def _store(self, ticker, fetched_at, info):
+        with self._lock:
+            self._entries[ticker] = (fetched_at, info)
+            self._entries.move_to_end(ticker)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # --- On-disk layer ---
+    def _path(self, ticker):
+        return os.path.join(self.persist_dir, f"{ticker}.json")
+
+    def _load(self, ticker):
+        if self.persist_dir is None:
+            return None
+        try:
+            with open(self._path(ticker)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        return entry["fetched_at"], entry["info"]
+
+    def _save(self, ticker, fetched_at, info):
+        # Unknown or mistyped tickers come back empty and are not worth a file
+        if self.persist_dir is None or not info:
+            return
+        os.makedirs(self.persist_dir, exist_ok=True)
+        tmp_path = self._path(ticker) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"fetched_at": fetched_at, "info": info}, f, default=str)
+        os.replace(tmp_path, self._path(ticker))
+
+    # --- Public API ---
+    def get(self, ticker):
+        """
+        Return Ticker.info for a ticker, fetching it only when no fresh copy is cached.
+
+        Args:
+            ticker (str): Stock ticker symbol (e.g., "AAPL").
+
+        Returns:
+            dict: Company fundamentals.
+
+        Raises:
+            ValueError: If ticker is not a valid symbol (see providers.check_ticker).
+        """
+        ticker = check_ticker(ticker)
+        info = self._lookup(ticker)
+        cache_result("fundamentals", info is not None)
+        if info is not None:
+            return info
+        # Sessions missing the same ticker at once share one disk read / upstream call
+        return self._flights.do(ticker, lambda: self._fetch(ticker))
+
+    def _fetch(self, ticker):
+        entry = self._load(ticker)
+        if entry is None:
+            info = get_provider().info(ticker)
+            entry = (time.time(), info)
+            self._save(ticker, *entry)
+        self._store(ticker, *entry)
+        return entry[1]
+
+    def preload(self, tickers):
+        """
+        Warm the cache for a list of tickers in a background thread.
+
+        Tickers that are cached and still fresh, or already being preloaded, are
+        skipped, so this is cheap to call on every page rerun. Expired entries are
+        warmed again, so popular tickers never wait on upstream once the TTL passes.
+
+        Args:
+            tickers (list[str]): Ticker symbols to warm.
+        """
+        symbols = []
+        for ticker in tickers:
+            try:
+                symbols.append(check_ticker(ticker))
+            except ValueError:
+                continue
+        now = time.time()
+        with self._lock:
+            pending = [t for t in symbols if t not in self._preloading
+                       and (t not in self._entries or now - self._entries[t][0] > self.ttl)]
+            self._preloading.update(pending)
+        if not pending:
+            return
+
+        def _run():
+            for ticker in pending:
+                try:
+                    self.get(ticker)
+                except Exception:
+                    # Preloading is best effort, a failed ticker is fetched on demand later
+                    pass
+                finally:
+                    with self._lock:
+                        self._preloading.discard(ticker)
+
+        threading.Thread(target=_run, name="fundamentals-preload", daemon=True).start()
+
+
+_cache = FundamentalsCache(
+    persist_dir=os.path.join(DATA_DIR, "fundamentals") if FUNDAMENTALS_PERSIST else None
+)
+
+
+def get_info(ticker):
+    """Return cached company fundamentals for a ticker (see FundamentalsCache.get)."""
+    return _cache.get(ticker)
+
+
+def preload(tickers):
+    """Warm the shared fundamentals cache in the background (see FundamentalsCache.preload)."""
+    _cache.preload(tickers)
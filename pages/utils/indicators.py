@@ -0,0 +1,233 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+# Default indicator settings used by the analysis charts
+RSI_LENGTH = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+SMA_LENGTH = 50
+EMA_LENGTH = 20
+
+INDICATOR_COLUMNS = ["RSI", "MACD", "MACD Signal", "MACD Hist", "SMA_50", "EMA_20"]
+
+
+# --- Array kernels ---
+def _smoothed(values, length, alpha):
+    # Exponential smoothing seeded with the simple mean of the first `length` values,
+    # run as a first-order IIR filter so the recursion happens in C
+    out = np.full(len(values), np.nan)
+    if len(values) < length:
+        return out
+    seed = values[:length].mean()
+    out[length - 1] = seed
+    if len(values) > length:
+        from scipy.signal import lfilter
+        out[length:], _ = lfilter([alpha], [1.0, alpha - 1.0], values[length:], zi=[(1.0 - alpha) * seed])
+    return out
+
+
+def ema(values, length):
+    """Exponential moving average (SMA-seeded) of a 1D float array."""
+    return _smoothed(values, length, 2.0 / (length + 1))
+
+
+def wilder(values, length):
+    """Wilder's smoothing (RMA) of a 1D float array."""
+    return _smoothed(values, length, 1.0 / length)
+
+
+def sma(values, length):
+    """Simple moving average of a 1D float array."""
+    out = np.full(len(values), np.nan)
+    if len(values) < length:
+        return out
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    out[length - 1:] = (csum[length:] - csum[:-length]) / length
+    return out
+
+
+def rsi(values, length=RSI_LENGTH):
+    """Relative Strength Index of a 1D float array."""
+    out = np.full(len(values), np.nan)
+    delta = np.diff(values)
+    avg_gain = wilder(np.clip(delta, 0, None), length)
+    avg_loss = wilder(np.clip(-delta, 0, None), length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = 100.0 * avg_gain / (avg_gain + avg_loss)
+    return out
+
+
+def macd(values, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    """
+    MACD line, signal line and histogram of a 1D float array.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (macd, signal, histogram).
+    """
+    line = ema(values, fast) - ema(values, slow)
+    signal_line = np.full(len(values), np.nan)
+    signal_line[slow - 1:] = ema(line[slow - 1:], signal)
+    return line, signal_line, line - signal_line
+
+
+# --- Batched engine ---
+def compute_indicators(dataframe):
+    """
+    Compute every chart indicator from the Close column in one pass.
+
+    The price frame is not modified. The result shares its index, so it can be
+    aligned with any filtered slice of the prices via `.loc[slice.index]`. It is
+    backed by a single read-only array and is meant to be shared, not edited.
+
+    Args:
+        dataframe (pd.DataFrame): Price history with a 'Close' column.
+
+    Returns:
+        pd.DataFrame: RSI, MACD, MACD Signal, MACD Hist, SMA_50 and EMA_20 columns.
+    """
+    close = dataframe['Close'].to_numpy(dtype=float)
+    macd_line, signal_line, histogram = macd(close)
+
+    values = np.column_stack([
+        rsi(close),
+        macd_line,
+        signal_line,
+        histogram,
+        sma(close, SMA_LENGTH),
+        ema(close, EMA_LENGTH)
+    ])
+    return indicator_frame(values, dataframe.index)
+
+
+def indicator_frame(values, index):
+    """Wrap a (rows, INDICATOR_COLUMNS) array in a read-only indicator frame."""
+    values = np.array(values, dtype=float).reshape(len(index), len(INDICATOR_COLUMNS))
+    values.flags.writeable = False
+    return pd.DataFrame(values, index=index, columns=INDICATOR_COLUMNS, copy=False)
+
+
+# --- Streaming state ---
+# Each state consumes one bar per update() call in O(1) and produces the same
+# values as the batch kernels above.
+class EMAState:
+    """Running SMA-seeded exponential smoothing (EMA, or Wilder's RMA with alpha=1/length)."""
+
+    def __init__(self, length, alpha=None, count=0, total=0.0, value=None):
+        self.length = length
+        self.alpha = alpha if alpha is not None else 2.0 / (length + 1)
+        self.count = count
+        self.total = total
+        self.value = value
+
+    def update(self, x):
+        self.count += 1
+        if self.count < self.length:
+            self.total += x
+            return np.nan
+        if self.count == self.length:
+            self.value = (self.total + x) / self.length
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    def to_dict(self):
+        return {"length": self.length, "alpha": self.alpha, "count": self.count,
+                "total": self.total, "value": self.value}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+class SMAState:
+    """Running simple moving average over a ring buffer of the last `length` values."""
+
+    def __init__(self, length, window=(), total=0.0):
+        self.length = length
+        self.window = deque(window, maxlen=length)
+        self.total = total
+
+    def update(self, x):
+        if len(self.window) == self.length:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        if len(self.window) < self.length:
+            return np.nan
+        return self.total / self.length
+
+    def to_dict(self):
+        return {"length": self.length, "window": list(self.window), "total": self.total}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+class IndicatorState:
+    """
+    Incremental version of compute_indicators: feed closes one bar at a time.
+
+    Holds the running EMA/Wilder values for RSI and MACD plus the SMA ring buffer,
+    and round-trips through to_dict()/from_dict() so it can be saved with the
+    stored price history.
+    """
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.prev_close = state.get("prev_close")
+        self.avg_gain = self._ema(state, "avg_gain", RSI_LENGTH, 1.0 / RSI_LENGTH)
+        self.avg_loss = self._ema(state, "avg_loss", RSI_LENGTH, 1.0 / RSI_LENGTH)
+        self.fast = self._ema(state, "fast", MACD_FAST)
+        self.slow = self._ema(state, "slow", MACD_SLOW)
+        self.signal = self._ema(state, "signal", MACD_SIGNAL)
+        self.trend = self._ema(state, "trend", EMA_LENGTH)
+        self.sma = SMAState.from_dict(state["sma"]) if "sma" in state else SMAState(SMA_LENGTH)
+
+    @staticmethod
+    def _ema(state, key, length, alpha=None):
+        return EMAState.from_dict(state[key]) if key in state else EMAState(length, alpha)
+
+    def update(self, close):
+        """
+        Consume one close price.
+
+        Returns:
+            list[float]: Indicator values for the bar, ordered as INDICATOR_COLUMNS.
+        """
+        close = float(close)
+
+        rsi_value = np.nan
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            gain = self.avg_gain.update(max(delta, 0.0))
+            loss = self.avg_loss.update(max(-delta, 0.0))
+            if not np.isnan(gain) and gain + loss > 0:
+                rsi_value = 100.0 * gain / (gain + loss)
+        self.prev_close = close
+
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        macd_value = fast - slow
+        signal_value = np.nan if np.isnan(macd_value) else self.signal.update(macd_value)
+
+        return [rsi_value, macd_value, signal_value, macd_value - signal_value,
+                self.sma.update(close), self.trend.update(close)]
+
+    def to_dict(self):
+        return {
+            "prev_close": self.prev_close,
+            "avg_gain": self.avg_gain.to_dict(),
+            "avg_loss": self.avg_loss.to_dict(),
+            "fast": self.fast.to_dict(),
+            "slow": self.slow.to_dict(),
+            "signal": self.signal.to_dict(),
+            "trend": self.trend.to_dict(),
+            "sma": self.sma.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state)
@@ -0,0 +1,39 @@
+import importlib
+import threading
+
+
+# Modules that dominate import time; pages import them on first use instead of at load
+HEAVY_MODULES = [
+    "yfinance",
+    "scipy.signal",
+    "sklearn.metrics",
+    "sklearn.preprocessing",
+    "statsmodels.tsa.arima.model",
+]
+
+_warm_started = False
+_warm_guard = threading.Lock()
+
+
+def warm_imports(modules=HEAVY_MODULES):
+    """
+    Import the heavy modules once in a background thread, so the first
+    forecast or indicator request does not pay for them after the page has painted.
+
+    Args:
+        modules (list[str]): Module names to import.
+    """
+    global _warm_started
+    with _warm_guard:
+        if _warm_started:
+            return
+        _warm_started = True
+
+    def _import_all():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    threading.Thread(target=_import_all, name="warm-imports", daemon=True).start()
@@ -0,0 +1,48 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+
+# Regular US equity session. Exchange holidays are not modelled, so on a
+# holiday the market simply counts as "closed since the previous close".
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def _now(now=None):
+    return (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+
+
+def is_open(now=None):
+    """Return True while the regular trading session is running."""
+    now = _now(now)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def last_close(now=None):
+    """
+    Return the most recent regular-session close at or before now.
+
+    Returns:
+        datetime: Timezone-aware close time in MARKET_TZ.
+    """
+    now = _now(now)
+    close = datetime.combine(now.date(), MARKET_CLOSE, tzinfo=MARKET_TZ)
+    if now < close:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= timedelta(days=1)
+    return close
+
+
+def next_close(now=None):
+    """
+    Return the next regular-session close strictly after now.
+
+    Returns:
+        datetime: Timezone-aware close time in MARKET_TZ.
+    """
+    close = last_close(now) + timedelta(days=1)
+    while close.weekday() >= 5:
+        close += timedelta(days=1)
+    return close
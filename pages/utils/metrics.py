@@ -0,0 +1,244 @@
+import os
+import json
+import math
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from pages.utils.config import METRICS_FILE
+
+
+# Latency histogram bucket bounds in seconds (Prometheus-style, cumulative on export)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ITERATION_BUCKETS = (5, 10, 25, 50, 100, 250, 500)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_gauges = {}
+# Spans of the current page run, per script thread
+_trace = threading.local()
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with a running sum and count.
+
+    Args:
+        buckets (tuple[float]): Upper bounds of the buckets, ascending.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "sum": self.sum,
+            "count": self.count
+        }
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+# --- Recording ---
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    """Add a value to the histogram `name` with the given labels."""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+
+def increment(name, amount=1, **labels):
+    """Increase the counter `name` with the given labels."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    """Set the gauge `name` with the given labels to value."""
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def cache_result(cache, hit):
+    """Count a cache lookup as a hit or a miss."""
+    increment("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def record_fit(model_fit, model="arima"):
+    """
+    Record optimiser convergence statistics of a fitted statsmodels model.
+
+    Args:
+        model_fit: Fitted results object exposing mle_retvals.
+        model (str): Model label.
+    """
+    retvals = getattr(model_fit, "mle_retvals", None) or {}
+    increment("model_fits_total", model=model, converged=str(bool(retvals.get("converged", False))).lower())
+    if "iterations" in retvals:
+        observe("model_fit_iterations", retvals["iterations"], buckets=ITERATION_BUCKETS, model=model)
+
+
+# --- Tracing ---
+def start_trace():
+    """Start collecting spans for a new page run on this thread."""
+    _trace.spans = []
+    _trace.depth = 0
+
+
+def current_trace():
+    """
+    Return the spans recorded on this thread since start_trace.
+
+    Returns:
+        list[dict]: Stage, nesting depth, start offset and duration (ms) per span, in start order.
+    """
+    return list(getattr(_trace, "spans", []))
+
+
+@contextmanager
+def span(stage):
+    """
+    Time a stage: the duration is added to the `stage_seconds` histogram and,
+    when a trace is active on this thread, to the current page run's trace.
+
+    Args:
+        stage (str): Stage name (e.g., "fetch_history").
+    """
+    spans = getattr(_trace, "spans", None)
+    record = None
+    if spans is not None:
+        record = {"stage": stage, "depth": _trace.depth}
+        spans.append(record)
+        _trace.depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        observe("stage_seconds", elapsed, stage=stage)
+        if record is not None:
+            _trace.depth -= 1
+            record["ms"] = round(elapsed * 1000, 3)
+
+
+# --- Export ---
+def snapshot():
+    """
+    Return every metric recorded in this process.
+
+    Returns:
+        dict: {"counters": [...], "gauges": [...], "histograms": [...]}, each entry with
+            name, labels and value(s).
+    """
+    with _lock:
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(_counters.items())]
+        gauges = [{"name": name, "labels": dict(labels), "value": value}
+                  for (name, labels), value in sorted(_gauges.items())]
+        histograms = [{"name": name, "labels": dict(labels), **histogram.to_dict()}
+                      for (name, labels), histogram in sorted(_histograms.items())]
+    return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+def _labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_text():
+    """Render every metric in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+    for name in sorted({c["name"] for c in data["counters"]}):
+        lines.append(f"# TYPE stock_{name} counter")
+        lines += [f"stock_{name}{_labels(c['labels'])} {c['value']}"
+                  for c in data["counters"] if c["name"] == name]
+    for name in sorted({g["name"] for g in data["gauges"]}):
+        lines.append(f"# TYPE stock_{name} gauge")
+        lines += [f"stock_{name}{_labels(g['labels'])} {g['value']}"
+                  for g in data["gauges"] if g["name"] == name]
+    for name in sorted({h["name"] for h in data["histograms"]}):
+        lines.append(f"# TYPE stock_{name} histogram")
+        for h in (h for h in data["histograms"] if h["name"] == name):
+            cumulative = 0
+            for bound, count in zip(list(h["buckets"]) + [math.inf], h["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                lines.append(f"stock_{name}_bucket{_labels(h['labels'], le=le)} {cumulative}")
+            lines.append(f"stock_{name}_sum{_labels(h['labels'])} {h['sum']}")
+            lines.append(f"stock_{name}_count{_labels(h['labels'])} {h['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def export(path=METRICS_FILE):
+    """
+    Write the metrics to a file: Prometheus text format for *.prom (e.g. for the
+    node_exporter textfile collector), JSON otherwise. Does nothing without a path.
+
+    Args:
+        path (str, optional): Output file, defaults to STOCK_METRICS_FILE.
+    """
+    if not path:
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        if path.endswith(".prom"):
+            f.write(prometheus_text())
+        else:
+            json.dump(snapshot(), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# --- Debug panel ---
+def show_debug_panel(render_seconds=None):
+    """
+    Render the spans of the current page run in a collapsed expander.
+
+    Args:
+        render_seconds (float, optional): Total render time of the run.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    spans = current_trace()
+    with st.expander("Debug: stage timings"):
+        if render_seconds is not None:
+            st.write(f"**Total render:** {render_seconds * 1000:.1f} ms")
+        if spans:
+            table = pd.DataFrame(spans)
+            table["stage"] = [" " * depth + stage for depth, stage in zip(table["depth"], table["stage"])]
+            st.dataframe(table[["stage", "ms"]], hide_index=True)
+        data = snapshot()
+        first_paint = [g for g in data["gauges"] if g["name"] == "page_first_paint_seconds"]
+        if first_paint:
+            st.write("**Cold first paint (process lifetime)**")
+            st.dataframe(pd.DataFrame([{**g["labels"], "seconds": g["value"]} for g in first_paint]),
+                         hide_index=True)
+        counters = [c for c in data["counters"] if c["name"] == "cache_requests_total"]
+        if counters:
+            st.write("**Cache lookups (process lifetime)**")
+            st.dataframe(pd.DataFrame([{**c["labels"], "count": c["value"]} for c in counters]),
+                         hide_index=True)
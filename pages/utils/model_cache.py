@@ -0,0 +1,102 @@
+import os
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from pages.utils.config import DATA_DIR, MODEL_CACHE_SIZE, MODEL_CACHE_PERSIST
+from pages.utils.metrics import cache_result
+
+
+def fingerprint(data):
+    """
+    Hash the values of a series or array so identical inputs map to the same key.
+
+    Args:
+        data (np.ndarray or pd.Series): Model input data.
+
+    Returns:
+        str: Hex digest of the data.
+    """
+    values = np.ascontiguousarray(np.asarray(data, dtype=float))
+    return hashlib.sha1(values.tobytes()).hexdigest()
+
+
+def model_key(ticker, period, data, order):
+    """Build the cache key for a fitted model: ticker, period, data fingerprint and order."""
+    return (ticker, period, fingerprint(data), tuple(order))
+
+
+class ModelCache:
+    """
+    Process-wide LRU cache of fitted models (or other picklable model results),
+    optionally pickled to disk.
+
+    Args:
+        maxsize (int): Maximum number of fitted models kept in memory.
+        persist_dir (str, optional): Directory for pickled models, None to disable it.
+        name (str): Cache name used in the hit/miss metrics.
+    """
+
+    def __init__(self, maxsize=MODEL_CACHE_SIZE, persist_dir=None, name="models"):
+        self.maxsize = maxsize
+        self.persist_dir = persist_dir
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.persist_dir, f"{name}.pkl")
+
+    def get(self, key):
+        """Return the cached fitted model for key, or None."""
+        model_fit = self._get(key)
+        cache_result(self.name, model_fit is not None)
+        return model_fit
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if self.persist_dir is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                model_fit = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        self._remember(key, model_fit)
+        return model_fit
+
+    def put(self, key, model_fit):
+        """Store a fitted model under key."""
+        self._remember(key, model_fit)
+        if self.persist_dir is None:
+            return
+        os.makedirs(self.persist_dir, exist_ok=True)
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(model_fit, f)
+        os.replace(tmp_path, self._path(key))
+
+    def clear(self):
+        """Drop every in-memory entry (persisted pickles are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, model_fit):
+        with self._lock:
+            self._entries[key] = model_fit
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+models = ModelCache(
+    persist_dir=os.path.join(DATA_DIR, "models") if MODEL_CACHE_PERSIST else None
+)
@@ -1,11 +1,39 @@
-import yfinance as yf
-from statsmodels.tsa.stattools import adfuller
-from sklearn.metrics import mean_squared_error, r2_score
-from statsmodels.tsa.arima.model import ARIMA
+import os
+import threading
 import numpy as np
-from sklearn.preprocessing import StandardScaler
 from datetime import datetime, timedelta
 import pandas as pd
+from pages.utils.data_store import load_history, slice_period
+from pages.utils.model_cache import ModelCache, models, model_key
+from pages.utils.stationarity import adf_test, differencing_order
+from pages.utils.engines import get_engine
+from pages.utils.metrics import span, record_fit, increment
+from pages.utils.single_flight import SingleFlight
+from pages.utils.config import (
+    DATA_DIR,
+    MODEL_CACHE_PERSIST,
+    MODEL_REFIT_BARS,
+    MODEL_DRIFT_Z,
+    SCALER_DRIFT
+)
+
+
+# Identical fits requested by concurrent sessions run once and share the fitted model
+_fit_flights = SingleFlight("fit")
+
+# Latest fitted state per (ticker, period, order) and scaler per (ticker, period), so a
+# series that only gained new bars is extended instead of refitted
+lineages = ModelCache(
+    persist_dir=os.path.join(DATA_DIR, "lineages") if MODEL_CACHE_PERSIST else None,
+    name="lineages"
+)
+scalers = ModelCache(
+    persist_dir=os.path.join(DATA_DIR, "scalers") if MODEL_CACHE_PERSIST else None,
+    name="scalers"
+)
+_lineages_lock = threading.Lock()
+# Fitted states kept per (ticker, period, order): the evaluation and the forecast fit
+MAX_LINEAGES = 4
 
 
 # --- Fetch stock data ---
@@ -20,14 +48,14 @@ def get_data(ticker, period="1y"):
     Returns:
         pd.DataFrame: Stock data with Close column.
     """
-    stock_data = yf.download(ticker, period=period)
+    stock_data = slice_period(load_history(ticker), period)
     return stock_data[['Close']]
 
 
 # --- Stationarity test (ADF) ---
 def stationary_check(close_price):
-    adf_test = adfuller(close_price)
-    p_value = round(adf_test[1], 3)
+    adf_result = adf_test(np.asarray(close_price, dtype=float).ravel())
+    p_value = round(adf_result[1], 3)
     return p_value
 
 
@@ -41,39 +69,151 @@ def get_rolling_mean(close_price):
 
 # --- Differencing order finder ---
 def get_differencing_order(close_price):
-    p_value = stationary_check(close_price)
-    d = 0
-    while True:
-        if p_value > 0.05:
-            d += 1
-            close_price = close_price.diff().dropna()
-            p_value = stationary_check(close_price)
-        else:
-            break
-    return d
+    # Tests every d up to MAX_DIFFERENCING_ORDER in one pass, memoized per data fingerprint
+    return differencing_order(close_price)
 
 
 # --- Fit ARIMA model ---
-def fit_model(data, differencing_order):
-    model = ARIMA(data, order=(30, differencing_order, 30))
-    model_fit = model.fit()
+def get_fitted_model(data, order, ticker=None, period=None, start_params=None):
+    """
+    Return a fitted ARIMA model, reusing a cached fit for identical inputs.
+
+    Args:
+        data (np.ndarray or pd.Series): Series to fit.
+        order (tuple): ARIMA (p, d, q) order.
+        ticker (str, optional): Ticker symbol, part of the cache key.
+        period (str, optional): Data period, part of the cache key.
+        start_params (np.ndarray, optional): Parameters to warm-start the optimiser from.
+
+    Returns:
+        ARIMAResults: Fitted model.
+    """
+    key = model_key(ticker, period, data, order)
+    model_fit = models.get(key)
+    if model_fit is None:
+        model_fit = _fit_flights.do(key, lambda: _update_or_fit(key, data, order, ticker, period, start_params))
+    return model_fit
+
+
+def _update_or_fit(key, data, order, ticker, period, start_params):
+    values = np.asarray(data, dtype=float).ravel()
+    model_fit = _extend(ticker, period, order, values) if ticker is not None else None
+    if model_fit is None:
+        model_fit = _fit_arima(data, order, start_params)
+        if ticker is not None:
+            _remember_lineage(ticker, period, order, None, {"model_fit": model_fit, "values": values, "appended": 0})
+    models.put(key, model_fit)
+    return model_fit
+
+
+def _fit_arima(data, order, start_params):
+    from statsmodels.tsa.arima.model import ARIMA
+    with span("arima.fit"):
+        model = ARIMA(data, order=order)
+        model_fit = model.fit(start_params=start_params)
+    record_fit(model_fit, model="arima")
+    return model_fit
+
+
+# --- Incremental updates ---
+def new_bars(seen, values, limit=MODEL_REFIT_BARS):
+    """
+    Find the bars values adds to seen, when values is seen moved forward by a few bars
+    (a growing series, or a fixed-length window that also dropped its oldest bars).
+
+    Args:
+        seen (np.ndarray): Series a model or scaler was fitted on.
+        values (np.ndarray): Current series.
+        limit (int): Largest number of new bars considered.
+
+    Returns:
+        np.ndarray or None: The new bars (possibly empty), or None if values does not continue seen.
+    """
+    for count in range(min(limit, len(values) - 1) + 1):
+        overlap = len(values) - count
+        if overlap <= len(seen) and np.array_equal(values[:overlap], seen[len(seen) - overlap:]):
+            return values[overlap:]
+    return None
+
+
+def _extend(ticker, period, order, values):
+    """
+    Extend a remembered fit of an earlier version of the series with the bars added since:
+    the parameters are kept and only the Kalman filter state is updated. Returns None
+    (a full refit is due) when no fit matches, after MODEL_REFIT_BARS appended bars, or
+    when the new bars' standardized one-step errors exceed MODEL_DRIFT_Z.
+    """
+    lineage_key = (ticker, period, tuple(order))
+    for lineage in lineages.get(lineage_key) or ():
+        bars = new_bars(lineage["values"], values)
+        if bars is None:
+            continue
+        if not len(bars):
+            return lineage["model_fit"]
+        if lineage["appended"] + len(bars) > MODEL_REFIT_BARS:
+            increment("model_refits_total", model="arima", reason="schedule")
+            return None
+
+        with span("arima.extend"):
+            model_fit = lineage["model_fit"].extend(bars)
+        errors = np.asarray(model_fit.filter_results.standardized_forecasts_error, dtype=float)
+        if np.sqrt(np.nanmean(errors ** 2)) > MODEL_DRIFT_Z:
+            increment("model_refits_total", model="arima", reason="drift")
+            return None
+
+        increment("model_updates_total", model="arima")
+        _remember_lineage(ticker, period, order, lineage,
+                          {"model_fit": model_fit, "values": values, "appended": lineage["appended"] + len(bars)})
+        return model_fit
+    return None
+
+
+def _remember_lineage(ticker, period, order, previous, lineage):
+    # Newest first; the state it was extended from is replaced
+    lineage_key = (ticker, period, tuple(order))
+    with _lineages_lock:
+        kept = [entry for entry in lineages.get(lineage_key) or () if entry is not previous]
+        lineages.put(lineage_key, tuple([lineage] + kept[:MAX_LINEAGES - 1]))
+
+
+def fit_model(data, differencing_order, ticker=None, period=None, start_params=None, order=None,
+              engine="arima"):
+    # Fast engines (see engines.ENGINES) fit in milliseconds and skip the model cache
+    if engine != "arima":
+        with span(f"{engine}.fit"):
+            return get_engine(engine).fit(data, differencing_order, order).forecast(30)
+
+    # Without an explicit order (see order_search.select_order) fall back to the fixed (30, d, 30)
+    order = order or (30, differencing_order, 30)
+    model_fit = get_fitted_model(data, order, ticker, period, start_params)
     forecast_steps = 30
-    forecast = model_fit.get_forecast(steps=forecast_steps)
+    with span("arima.forecast"):
+        forecast = model_fit.get_forecast(steps=forecast_steps)
     predictions = forecast.predicted_mean
     return predictions
 
 # --- Evaluate model ---
-def evaluate_model(original_price, differencing_order):
+def evaluate_model(original_price, differencing_order, ticker=None, period=None, order=None,
+                   engine="arima"):
     train_data, test_data = original_price[:-30], original_price[-30:]
-    predictions = fit_model(train_data, differencing_order)
+    predictions = fit_model(train_data, differencing_order, ticker, period, order=order, engine=engine)
+    from sklearn.metrics import mean_squared_error
     rmse = np.sqrt(mean_squared_error(test_data, predictions))
     return round(rmse, 2)
 
 
 
 # --- Get future forecast (30 days ahead) ---
-def get_forecast(original_price, differencing_order):
-    predictions = fit_model(original_price, differencing_order)
+def get_forecast(original_price, differencing_order, ticker=None, period=None, order=None,
+                 engine="arima"):
+    start_params = None
+    if engine == "arima":
+        # Warm-start the full-series fit from the evaluation fit on the train split, if cached
+        order = order or (30, differencing_order, 30)
+        evaluation_fit = models.get(model_key(ticker, period, original_price[:-30], order))
+        start_params = evaluation_fit.params if evaluation_fit is not None else None
+
+    predictions = fit_model(original_price, differencing_order, ticker, period, start_params, order, engine)
     start_date = datetime.now().strftime('%Y-%m-%d')
     end_date = (datetime.now() + timedelta(days=29)).strftime('%Y-%m-%d')
     forecast_index = pd.date_range(start=start_date, end=end_date, freq='D')
@@ -83,19 +223,41 @@ def get_forecast(original_price, differencing_order):
 
 
 # --- Scale the close price series ---
-def scaling(close_price):
+def scaling(close_price, ticker=None, period=None):
     """
     Scales the stock prices to have mean=0 and std=1.
+
+    With a ticker, the scaler is kept while the series only gains new bars, so the
+    scaled values a fitted model has seen stay unchanged and the model can be
+    extended instead of refitted. It is refitted on the same schedule as the models
+    (MODEL_REFIT_BARS) or once the scaled window drifts by more than SCALER_DRIFT.
     
     Args:
         close_price (pd.Series): Series of stock closing prices.
+        ticker (str, optional): Ticker symbol, keys the kept scaler.
+        period (str, optional): Data period, keys the kept scaler.
         
     Returns:
         scaled_data (np.ndarray): Scaled prices (2D array).
         scaler (StandardScaler): Fitted scaler to inverse transform later.
     """
+    values = np.array(close_price, dtype=float).reshape(-1, 1)
+    state = scalers.get((ticker, period)) if ticker is not None else None
+    if state is not None:
+        bars = new_bars(state["values"], values.ravel())
+        if bars is not None and state["appended"] + len(bars) <= MODEL_REFIT_BARS:
+            scaled_data = state["scaler"].transform(values)
+            if abs(scaled_data.mean()) <= SCALER_DRIFT and abs(scaled_data.std() - 1) <= SCALER_DRIFT:
+                if len(bars):
+                    scalers.put((ticker, period), {**state, "values": values.ravel(),
+                                                   "appended": state["appended"] + len(bars)})
+                return scaled_data, state["scaler"]
+
+    from sklearn.preprocessing import StandardScaler
     scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(np.array(close_price).reshape(-1, 1))
+    scaled_data = scaler.fit_transform(values)
+    if ticker is not None:
+        scalers.put((ticker, period), {"scaler": scaler, "values": values.ravel(), "appended": 0})
     return scaled_data, scaler
 
 
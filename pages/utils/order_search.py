@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import threading
+import warnings
+from concurrent.futures import wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from pages.utils.config import DATA_DIR, ORDER_SEARCH_BUDGET_SECONDS, ORDER_MAX_AGE_DAYS
+from pages.utils.workers import get_pool
+
+
+ORDERS_PATH = os.path.join(DATA_DIR, "orders.json")
+
+_orders_lock = threading.Lock()
+
+
+# --- Worker side ---
+def _score_order(data, order, criterion):
+    # Runs in a worker process: fit one candidate and return its information criterion
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            model_fit = ARIMA(data, order=order).fit(method_kwargs={"maxiter": 50})
+        except Exception:
+            return order, np.inf
+    return order, float(getattr(model_fit, criterion))
+
+
+# --- Remembered orders ---
+def _read_orders():
+    try:
+        with open(ORDERS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _order_key(ticker, period, criterion):
+    return f"{ticker}:{period}:{criterion}"
+
+
+def remembered_order(ticker, differencing_order, criterion="aic", period=None):
+    """
+    Return the order previously selected for a ticker and period, if it is still applicable.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        differencing_order (int): Current differencing order d.
+        criterion (str): "aic" or "bic".
+        period (str, optional): Data period the order was selected on (e.g., "1y").
+
+    Returns:
+        tuple or None: Stored (p, d, q) order, or None if nothing matches or it is
+            older than ORDER_MAX_AGE_DAYS.
+    """
+    entry = _read_orders().get(_order_key(ticker, period, criterion))
+    if entry is None or entry["order"][1] != differencing_order:
+        return None
+    if datetime.now() - datetime.fromisoformat(entry["selected_at"]) > timedelta(days=ORDER_MAX_AGE_DAYS):
+        return None
+    return tuple(entry["order"])
+
+
+def _remember_order(ticker, period, criterion, order, score):
+    with _orders_lock:
+        orders = _read_orders()
+        orders[_order_key(ticker, period, criterion)] = {
+            "order": list(order),
+            "score": score,
+            "selected_at": datetime.now().isoformat()
+        }
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp_path = ORDERS_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(orders, f)
+        os.replace(tmp_path, ORDERS_PATH)
+
+
+# --- Search ---
+def _score_serial(data, candidates, criterion, deadline):
+    results = []
+    for order in candidates:
+        if time.monotonic() >= deadline:
+            return results, True
+        results.append(_score_order(data, order, criterion))
+    return results, False
+
+
+def _score_parallel(pool, data, candidates, criterion, deadline):
+    results = []
+    pending = {pool.submit(_score_order, data, order, criterion) for order in candidates}
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # Out of budget: drop the queued fits of this round (running ones finish in the background)
+            for future in pending:
+                future.cancel()
+            return results, True
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        results.extend(future.result() for future in done)
+    return results, False
+
+
+def select_order(data, differencing_order, ticker=None, criterion="aic", max_p=5, max_q=5,
+                 budget=ORDER_SEARCH_BUDGET_SECONDS, patience=2, parallel=True, period=None):
+    """
+    Pick an ARIMA (p, d, q) order by AIC or BIC with a budgeted parallel grid search.
+
+    Candidates are evaluated in rounds of increasing complexity (p + q) across a
+    process pool. The search stops when the wall-clock budget runs out or when
+    `patience` consecutive rounds fail to improve the best score, so large orders
+    are pruned once smaller ones stop paying off. The winner is remembered per
+    ticker, period and criterion and reused for ORDER_MAX_AGE_DAYS.
+
+    The budget is a soft limit. A round is only started when the time left covers
+    the previous round's duration. Fits still running when the budget runs out
+    cannot be interrupted; their results are ignored, but they keep their workers
+    busy until they finish (at most one round, each fit capped at 50 iterations).
+
+    Args:
+        data (np.ndarray or pd.Series): Series to model.
+        differencing_order (int): Differencing order d.
+        ticker (str, optional): Ticker symbol used to remember the winning order.
+        criterion (str): "aic" or "bic".
+        max_p (int): Largest AR order to try.
+        max_q (int): Largest MA order to try.
+        budget (float): Wall-clock budget in seconds.
+        patience (int): Rounds without improvement before the search stops.
+        parallel (bool): Use the shared process pool. Pass False when already
+            running inside a worker process.
+        period (str, optional): Data period, part of the remembered order's key.
+
+    Returns:
+        tuple: Selected (p, d, q) order.
+    """
+    if ticker is not None:
+        order = remembered_order(ticker, differencing_order, criterion, period)
+        if order is not None:
+            return order
+
+    data = np.asarray(data, dtype=float).ravel()
+    deadline = time.monotonic() + budget
+    pool = get_pool() if parallel else None
+
+    best_order, best_score = (1, differencing_order, 1), np.inf
+    stale_rounds = 0
+    round_seconds = 0.0
+    for complexity in range(max_p + max_q + 1):
+        # Rounds only grow more expensive: skip one the remaining budget is unlikely to cover
+        if deadline - time.monotonic() < round_seconds:
+            break
+        candidates = [(p, differencing_order, complexity - p)
+                      for p in range(max(0, complexity - max_q), min(max_p, complexity) + 1)]
+        started = time.monotonic()
+        if pool is None:
+            results, out_of_budget = _score_serial(data, candidates, criterion, deadline)
+        else:
+            results, out_of_budget = _score_parallel(pool, data, candidates, criterion, deadline)
+        round_seconds = time.monotonic() - started
+
+        improved = False
+        for order, score in results:
+            if score < best_score:
+                best_order, best_score = order, score
+                improved = True
+
+        if out_of_budget:
+            break
+
+        stale_rounds = 0 if improved else stale_rounds + 1
+        if stale_rounds >= patience:
+            break
+
+    if ticker is not None and np.isfinite(best_score):
+        _remember_order(ticker, period, criterion, best_order, best_score)
+    return best_order
@@ -0,0 +1,57 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from pages.utils.config import PAGE_FETCH_THREADS, FETCH_TIMEOUT_SECONDS
+from pages.utils.metrics import increment, span
+
+
+# Shared by every session: page requests are I/O bound (network, Parquet), so threads overlap them
+_executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_THREADS, thread_name_prefix="page-fetch")
+
+
+def _timed(stage, fn, args, kwargs):
+    with span(stage):
+        return fn(*args, **kwargs)
+
+
+def submit(stage, fn, *args, **kwargs):
+    """
+    Start a page data request in the background.
+
+    Args:
+        stage (str): Stage name for the latency metrics (e.g., "fetch_history").
+        fn (callable): Function to run.
+        *args, **kwargs: Arguments for fn.
+
+    Returns:
+        concurrent.futures.Future: Pending result; pass it to `wait`.
+    """
+    future = _executor.submit(_timed, stage, fn, args, kwargs)
+    future.stage = stage
+    future.submitted_at = time.monotonic()
+    return future
+
+
+def wait(future, timeout=FETCH_TIMEOUT_SECONDS):
+    """
+    Wait for a request started with `submit`, at most `timeout` seconds after it was submitted.
+
+    A timed-out request keeps running in the background; its result still
+    lands in the store or cache for the next rerun.
+
+    Args:
+        future (concurrent.futures.Future): Request returned by `submit`.
+        timeout (float): Timeout in seconds, counted from submission.
+
+    Returns:
+        tuple: (result, None) on success, or (None, reason) with a short error description.
+    """
+    remaining = max(0.0, timeout - (time.monotonic() - future.submitted_at))
+    try:
+        return future.result(timeout=remaining), None
+    except TimeoutError:
+        increment("page_fetch_timeouts_total", stage=future.stage)
+        return None, f"timed out after {timeout:g}s"
+    except Exception as exc:
+        increment("page_fetch_errors_total", stage=future.stage)
+        return None, str(exc) or type(exc).__name__
@@ -0,0 +1,200 @@
+"""
+After-close precompute of history, indicators and forecasts for popular tickers.
+
+Usage:
+    python -m pages.utils.precompute --once      # refresh everything now
+    python -m pages.utils.precompute             # refresh after every market close
+"""
+import sys
+import time
+import argparse
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from pages.utils.artifacts import save_artifact, load_artifact
+from pages.utils.config import (
+    POPULAR_TICKERS,
+    PREDICTION_PERIODS,
+    PRECOMPUTE_ENABLED,
+    PRECOMPUTE_DELAY_MINUTES
+)
+from pages.utils.data_store import load_history, load_indicators
+from pages.utils.market_hours import MARKET_TZ, last_close, next_close
+from pages.utils.workers import get_precompute_pool
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+# Order-search criteria offered by the prediction page ("Auto (AIC)" / "Auto (BIC)")
+CRITERIA = ("aic", "bic")
+
+
+def forecast_artifact_name(ticker, period, criterion="aic"):
+    """Artifact name under which a ticker/period forecast is stored."""
+    return f"{ticker.upper()}_{period}_{criterion}"
+
+
+# --- Forecast pipeline ---
+def compute_forecast(ticker, period, criterion="aic", parallel=True):
+    """
+    Run the prediction page's pipeline for one ticker and period.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        period (str): Data period (e.g., "1y", "2y").
+        criterion (str): "aic" or "bic" for the order search.
+        parallel (bool): Let the order search use the worker pool.
+
+    Returns:
+        dict: differencing_order, order, rmse and forecast (price units, 'Close' column).
+    """
+    from pages.utils.models_trainer import (
+        get_data,
+        get_rolling_mean,
+        get_differencing_order,
+        scaling,
+        evaluate_model,
+        get_forecast,
+        inverse_scaling
+    )
+    from pages.utils.order_search import select_order
+
+    close_price = get_data(ticker, period)['Close']
+    rolling_price = get_rolling_mean(close_price)
+    differencing_order = get_differencing_order(rolling_price)
+    scaled_data, scaler = scaling(rolling_price, ticker, period)
+    order = select_order(scaled_data, differencing_order, ticker, criterion=criterion, parallel=parallel,
+                         period=period)
+
+    rmse = evaluate_model(scaled_data, differencing_order, ticker, period, order)
+    forecast = get_forecast(scaled_data, differencing_order, ticker, period, order)
+    forecast['Close'] = inverse_scaling(scaler, forecast['Close']).ravel()
+    return {
+        "differencing_order": differencing_order,
+        "order": order,
+        "rmse": rmse,
+        "forecast": forecast
+    }
+
+
+def _precompute_forecast(ticker, period, criterion):
+    # Runs in a worker process: compute and store one forecast artifact
+    started = time.perf_counter()
+    try:
+        result = compute_forecast(ticker, period, criterion, parallel=False)
+        save_artifact("forecast", forecast_artifact_name(ticker, period, criterion), result)
+        return ticker, period, "ok", None, time.perf_counter() - started
+    except Exception as error:
+        message = "".join(traceback.format_exception_only(type(error), error)).strip()
+        return ticker, period, "failed", message, time.perf_counter() - started
+
+
+# --- Refresh ---
+def refresh(tickers=POPULAR_TICKERS, periods=PREDICTION_PERIODS, criteria=CRITERIA):
+    """
+    Refresh history, indicators and every period's forecast for a list of tickers.
+
+    History and indicators are topped up in the local store; forecasts are fitted
+    in the scheduler's own worker pool (see workers.get_precompute_pool) and saved
+    as "forecast" artifacts, one per order-search criterion.
+
+    Args:
+        tickers (list[str]): Ticker symbols.
+        periods (list[str]): Prediction periods to forecast.
+        criteria (tuple[str]): Order-search criteria ("aic", "bic") to precompute.
+
+    Returns:
+        pd.DataFrame: Report with Ticker, Period, Criterion, Status, Seconds and Error columns.
+    """
+    report = []
+    for ticker in tickers:
+        try:
+            load_history(ticker)
+            load_indicators(ticker)
+        except Exception as error:
+            report.append({"Ticker": ticker, "Period": "history", "Criterion": None, "Status": "failed",
+                           "Seconds": 0.0, "Error": str(error)})
+
+    pool = get_precompute_pool()
+    tasks = [(ticker, period, criterion) for ticker in tickers for period in periods for criterion in criteria]
+    futures = [pool.submit(_precompute_forecast, *task) for task in tasks]
+    for (_, _, criterion), future in zip(tasks, futures):
+        ticker, period, status, error, seconds = future.result()
+        report.append({"Ticker": ticker, "Period": period, "Criterion": criterion, "Status": status,
+                       "Seconds": round(seconds, 3), "Error": error})
+    return pd.DataFrame(report)
+
+
+def is_complete(tickers=POPULAR_TICKERS, periods=PREDICTION_PERIODS, criteria=CRITERIA):
+    """Return True when every ticker/period/criterion forecast artifact exists and is fresh."""
+    return all(load_artifact("forecast", forecast_artifact_name(ticker, period, criterion)) is not None
+               for ticker in tickers for period in periods for criterion in criteria)
+
+
+# --- Scheduler ---
+def next_run(now=None):
+    """Return when the scheduler should run next: PRECOMPUTE_DELAY_MINUTES after a close."""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    delay = timedelta(minutes=PRECOMPUTE_DELAY_MINUTES)
+    run_at = last_close(now) + delay
+    if run_at > now:
+        return run_at
+    return next_close(now) + delay
+
+
+def _run_forever(tickers=POPULAR_TICKERS, criteria=CRITERIA):
+    # Catch up immediately if the artifacts are missing or from before the last close
+    if not is_complete(tickers, criteria=criteria):
+        refresh(tickers, criteria=criteria)
+    while True:
+        wait_seconds = (next_run() - datetime.now(MARKET_TZ)).total_seconds()
+        time.sleep(max(wait_seconds, 0))
+        try:
+            refresh(tickers, criteria=criteria)
+        except Exception:
+            traceback.print_exc()
+
+
+def start_scheduler(force=False):
+    """
+    Start the after-close scheduler in a background thread (once per process).
+
+    Does nothing unless STOCK_PRECOMPUTE=1 or force is True, so it is safe to
+    call on every page rerun.
+    """
+    global _scheduler
+    if not (PRECOMPUTE_ENABLED or force):
+        return
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = threading.Thread(target=_run_forever, name="precompute", daemon=True)
+            _scheduler.start()
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute history, indicators and forecasts.")
+    parser.add_argument("tickers", nargs="*", default=POPULAR_TICKERS, help="Ticker symbols")
+    parser.add_argument("--once", action="store_true", help="Refresh now and exit")
+    parser.add_argument("--criteria", nargs="+", default=list(CRITERIA), choices=CRITERIA,
+                        help="Order-search criteria to precompute (default: both)")
+    args = parser.parse_args(argv)
+
+    if not args.once:
+        _run_forever(args.tickers, tuple(args.criteria))
+        return 0
+
+    report = refresh(args.tickers, criteria=tuple(args.criteria))
+    print(report.to_string(index=False))
+    return 0 if (report["Status"] == "ok").all() else 1
+
+
+if __name__ == "__main__":
+    # Run through the package module so pool tasks pickle as pages.utils.precompute.*
+    # rather than __main__.*, which workers do not import
+    from pages.utils import precompute
+    sys.exit(precompute.main())
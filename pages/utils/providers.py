@@ -0,0 +1,320 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from pages.utils.config import (
+    PROVIDER,
+    REPLAY_DIR,
+    REPLAY_LATENCY_MS,
+    UPSTREAM_RATE,
+    UPSTREAM_BURST,
+    UPSTREAM_RETRIES,
+    UPSTREAM_BACKOFF_SECONDS
+)
+from pages.utils.metrics import increment, span
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+# Symbols as Yahoo spells them (e.g. "BRK-B", "^GSPC", "EURUSD=X"); no path separators
+TICKER_PATTERN = re.compile(r"[A-Z0-9.\-^=]{1,15}")
+
+
+# --- Ticker symbols ---
+def check_ticker(ticker):
+    """
+    Upper-case a ticker symbol and reject anything that is not one, so user
+    input never reaches a file path unchecked.
+
+    Args:
+        ticker (str): Ticker symbol as typed (e.g., "brk-b").
+
+    Returns:
+        str: Upper-cased symbol.
+
+    Raises:
+        ValueError: If ticker is not a valid symbol.
+    """
+    symbol = str(ticker).strip().upper()
+    if not TICKER_PATTERN.fullmatch(symbol):
+        raise ValueError(f"Invalid ticker symbol {ticker!r}")
+    return symbol
+
+
+# --- Throttling ---
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked.
+
+    Args:
+        rate (float): Sustained requests per second.
+        capacity (int): Burst size.
+    """
+
+    def __init__(self, rate=UPSTREAM_RATE, capacity=UPSTREAM_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# --- Provider interface ---
+class DataProvider:
+    """Source of daily price history and company fundamentals."""
+
+    name = None
+
+    def history(self, ticker, start=None, end=None):
+        """
+        Return daily OHLCV bars for a ticker.
+
+        Args:
+            ticker (str): Stock ticker symbol (e.g., "AAPL").
+            start (pd.Timestamp, optional): First date, None for the full history.
+            end (pd.Timestamp, optional): Exclusive end date, None for up to today.
+
+        Returns:
+            pd.DataFrame: Bars indexed by date (empty if the ticker is unknown).
+        """
+        raise NotImplementedError
+
+    def info(self, ticker):
+        """Return the company fundamentals (yfinance Ticker.info layout) for a ticker."""
+        raise NotImplementedError
+
+
+class EmptyHistory(Exception):
+    """Upstream returned no bars for a ticker it has served before."""
+
+
+class YFinanceProvider(DataProvider):
+    """
+    Live Yahoo Finance data over one pooled HTTP session, throttled by a token
+    bucket and retried with exponential backoff on rate limits and network errors.
+
+    yfinance logs most failures and returns an empty frame instead of raising, so
+    its exceptions are switched on and network errors retried. An empty answer
+    is only taken at face value for tickers that have never returned bars; for a
+    ticker that has, an empty full history is retried as a transient failure
+    instead of being reported as an unknown symbol.
+
+    Args:
+        rate (float): Sustained upstream requests per second.
+        burst (int): Upstream request burst size.
+        retries (int): Retries after the first failed attempt.
+        backoff (float): Delay before the first retry, doubled on every further one.
+    """
+
+    name = "yfinance"
+
+    def __init__(self, rate=UPSTREAM_RATE, burst=UPSTREAM_BURST, retries=UPSTREAM_RETRIES,
+                 backoff=UPSTREAM_BACKOFF_SECONDS):
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self._session = None
+        self._handles = OrderedDict()
+        self._known = set()
+        self._lock = threading.Lock()
+
+    def _handle(self, ticker):
+        # Handles are reused so history and info for a ticker share one yf.Ticker
+        import yfinance as yf
+        with self._lock:
+            if self._session is None:
+                from curl_cffi import requests as curl_requests
+                # Raise instead of logging, so failed requests reach the retry loop
+                yf.config.debug.hide_exceptions = False
+                self._session = curl_requests.Session(impersonate="chrome")
+            handle = self._handles.get(ticker)
+            if handle is None:
+                handle = self._handles[ticker] = yf.Ticker(ticker, session=self._session)
+                while len(self._handles) > 64:
+                    self._handles.popitem(last=False)
+            self._handles.move_to_end(ticker)
+            return handle
+
+    def _retryable(self, exc):
+        from yfinance.exceptions import YFRateLimitError
+        from curl_cffi.requests.exceptions import RequestException
+        return isinstance(exc, (YFRateLimitError, RequestException, ConnectionError, TimeoutError,
+                                EmptyHistory))
+
+    def _call(self, request, what):
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                with span(f"yfinance.{what}"):
+                    result = request()
+                increment("upstream_requests_total", provider=self.name, request=what, result="ok")
+                return result
+            except Exception as exc:
+                if attempt == self.retries or not self._retryable(exc):
+                    increment("upstream_requests_total", provider=self.name, request=what, result="error")
+                    raise
+                increment("upstream_requests_total", provider=self.name, request=what, result="retry")
+                # Full jitter keeps concurrent retries from hitting upstream in lockstep
+                time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def history(self, ticker, start=None, end=None):
+        handle = self._handle(ticker)
+        kwargs = {"period": "max"}
+        if start is not None:
+            kwargs = {"start": start.strftime("%Y-%m-%d")}
+            if end is not None:
+                kwargs["end"] = end.strftime("%Y-%m-%d")
+        return self._call(lambda: self._history(handle, ticker, full=start is None, **kwargs), "history")
+
+    def _history(self, handle, ticker, full, **kwargs):
+        from yfinance.exceptions import YFPricesMissingError, YFTickerMissingError, YFTzMissingError
+        try:
+            history = handle.history(**kwargs)
+        except YFTzMissingError:
+            # The timezone lookup also fails this way when the request itself failed
+            if ticker in self._known:
+                raise EmptyHistory(ticker)
+            return pd.DataFrame()
+        except (YFPricesMissingError, YFTickerMissingError):
+            history = pd.DataFrame()
+        if not history.empty:
+            self._known.add(ticker)
+        elif full and ticker in self._known:
+            # A range past the last bar is legitimately empty, the full history is not
+            raise EmptyHistory(ticker)
+        return history
+
+    def info(self, ticker):
+        handle = self._handle(ticker)
+        return self._call(lambda: handle.info, "info")
+
+
+class ReplayProvider(DataProvider):
+    """
+    Offline provider serving files recorded with `record`: {TICKER}.parquet
+    (history) and {TICKER}.info.json (fundamentals). Unknown tickers behave like
+    unknown symbols upstream (empty history, empty info).
+
+    Args:
+        directory (str): Directory holding the recorded files.
+        latency_ms (float): Simulated upstream latency per request, for load testing.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory=REPLAY_DIR, latency_ms=REPLAY_LATENCY_MS):
+        self.directory = directory
+        self.latency_ms = latency_ms
+
+    def _history_path(self, ticker):
+        return os.path.join(self.directory, f"{check_ticker(ticker)}.parquet")
+
+    def _info_path(self, ticker):
+        return os.path.join(self.directory, f"{check_ticker(ticker)}.info.json")
+
+    def _wait(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def load(self, ticker):
+        """Return the full recorded history for a ticker, or None if none was recorded."""
+        path = self._history_path(ticker)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def history(self, ticker, start=None, end=None):
+        self._wait()
+        history = self.load(ticker)
+        increment("upstream_requests_total", provider=self.name, request="history",
+                  result="ok" if history is not None else "error")
+        if history is None:
+            return pd.DataFrame()
+        if start is not None:
+            history = history[history.index >= pd.Timestamp(start)]
+        if end is not None:
+            history = history[history.index < pd.Timestamp(end)]
+        return history
+
+    def info(self, ticker):
+        self._wait()
+        try:
+            with open(self._info_path(ticker)) as f:
+                return json.load(f)
+        except OSError:
+            return {}
+
+
+# --- Recording ---
+def record(tickers, directory=REPLAY_DIR, source=None):
+    """
+    Save the full history and fundamentals of each ticker for the replay provider.
+
+    Args:
+        tickers (list[str]): Ticker symbols to record.
+        directory (str): Output directory.
+        source (DataProvider, optional): Provider to record from, live yfinance by default.
+    """
+    source = source or YFinanceProvider()
+    replay = ReplayProvider(directory)
+    os.makedirs(directory, exist_ok=True)
+    for ticker in map(check_ticker, tickers):
+        history = source.history(ticker)
+        if history.index.tz is not None:
+            history.index = history.index.tz_localize(None)
+        history.index.name = "Date"
+        history.to_parquet(replay._history_path(ticker))
+        with open(replay._info_path(ticker), "w") as f:
+            json.dump(source.info(ticker), f, default=str)
+        print(f"{ticker}: {len(history)} bars")
+
+
+# --- Process-wide provider ---
+PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "replay": ReplayProvider
+}
+
+
+def get_provider():
+    """Return the process-wide provider selected by STOCK_PROVIDER (created on first use)."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            if PROVIDER not in PROVIDERS:
+                raise ValueError(f"Unknown provider '{PROVIDER}', expected one of {sorted(PROVIDERS)}")
+            _provider = PROVIDERS[PROVIDER]()
+        return _provider
+
+
+def set_provider(provider):
+    """Replace the process-wide provider (e.g. with a ReplayProvider in tests or benchmarks)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+if __name__ == "__main__":
+    # Record replay files: python -m pages.utils.providers AAPL MSFT
+    record(sys.argv[1:])
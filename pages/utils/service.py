@@ -0,0 +1,408 @@
+"""
+Headless analysis service: history, indicators, fundamentals and forecasts over HTTP.
+
+Work is submitted as jobs and polled by ID, so a slow ARIMA fit never holds a
+Streamlit script thread and its result is shared by every client:
+
+    python -m pages.utils.service --port 8502
+
+    POST /jobs             {"kind": "forecast", "params": {"ticker": "AAPL", "period": "1y"}}
+                           -> 202 {"id": "...", "status": "queued", ...}
+    GET  /jobs/<id>        -> {"status": "queued" | "running" | "done" | "failed", "result": ...}
+    GET  /jobs             -> every job still kept
+    GET  /health, /metrics
+
+Forecasts run on the shared model worker pool (see workers.get_pool); history,
+indicators and fundamentals are I/O bound and run on the page fetch threads.
+At most SERVICE_MAX_JOBS jobs are queued or running at once; further
+submissions get 503. Identical submissions while a job is pending, or within
+SERVICE_JOB_TTL_SECONDS of it finishing, return the existing job.
+"""
+import sys
+import json
+import time
+import uuid
+import inspect
+import argparse
+import threading
+import traceback
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from pages.utils.config import (
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_MAX_JOBS,
+    SERVICE_JOB_TTL_SECONDS
+)
+from pages.utils.metrics import increment, observe, prometheus_text
+
+
+class ServiceError(Exception):
+    """Raised by the client when the service refuses a request or cannot be reached."""
+
+
+class QueueFull(Exception):
+    """Raised when SERVICE_MAX_JOBS jobs are already queued or running."""
+
+
+# --- JSON encoding of frames ---
+def frame_to_json(dataframe):
+    """
+    Encode a date-indexed frame as {"index", "index_name", "columns", "data"} (NaN as null).
+
+    Args:
+        dataframe (pd.DataFrame): Frame with a DatetimeIndex.
+
+    Returns:
+        dict: JSON-ready payload.
+    """
+    payload = json.loads(dataframe.to_json(orient="split", date_format="iso"))
+    payload["index_name"] = dataframe.index.name
+    return payload
+
+
+def frame_from_json(payload):
+    """Decode a frame encoded by frame_to_json."""
+    index = pd.DatetimeIndex(pd.to_datetime(payload["index"]), name=payload.get("index_name"))
+    return pd.DataFrame(payload["data"], index=index, columns=payload["columns"], dtype=float)
+
+
+# --- Jobs (run in worker threads or processes; results must be JSON-ready) ---
+def history_job(ticker, period="1y"):
+    from pages.utils.data_store import load_history, slice_period
+    return frame_to_json(slice_period(load_history(ticker), period))
+
+
+def indicators_job(ticker, period="1y"):
+    from pages.utils.data_store import load_history, load_indicators, slice_period
+    history = slice_period(load_history(ticker), period)
+    if history.empty:
+        return frame_to_json(history)
+    return frame_to_json(load_indicators(ticker, start=history.index[0]).reindex(history.index))
+
+
+def fundamentals_job(ticker):
+    from pages.utils.fundamentals import get_info
+    return get_info(ticker)
+
+
+def forecast_job(ticker, period="1y", engine="arima", order_mode="aic"):
+    """
+    Run the prediction page's pipeline: differencing order, scaling, order search,
+    RMSE on the last 30 days and the 30-day forecast.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        period (str): Data period (e.g., "1y", "5y").
+        engine (str): Forecast engine (see engines.ENGINES).
+        order_mode (str): "aic" or "bic" order search, or "fixed" for (30, d, 30). ARIMA only.
+
+    Returns:
+        dict: differencing_order, order, rmse, forecast (price units) and recent (last 60
+            rolling-mean closes), frames encoded with frame_to_json.
+    """
+    from pages.utils.models_trainer import (
+        get_data,
+        get_rolling_mean,
+        get_differencing_order,
+        scaling,
+        evaluate_model,
+        get_forecast,
+        inverse_scaling
+    )
+    from pages.utils.order_search import select_order
+
+    close_price = get_data(ticker, period)['Close']
+    rolling_price = get_rolling_mean(close_price)
+    differencing_order = get_differencing_order(rolling_price)
+    scaled_data, scaler = scaling(rolling_price, ticker, period)
+
+    if engine != "arima":
+        order = None
+    elif order_mode == "fixed":
+        order = (30, differencing_order, 30)
+    else:
+        # Already inside a pool worker, so search serially
+        order = select_order(scaled_data, differencing_order, ticker, criterion=order_mode, parallel=False,
+                             period=period)
+
+    rmse = evaluate_model(scaled_data, differencing_order, ticker, period, order, engine)
+    forecast = get_forecast(scaled_data, differencing_order, ticker, period, order, engine)
+    forecast['Close'] = inverse_scaling(scaler, forecast['Close']).ravel()
+    return {
+        "differencing_order": int(differencing_order),
+        "order": [int(x) for x in order] if order is not None else None,
+        "rmse": float(rmse),
+        "forecast": frame_to_json(forecast),
+        "recent": frame_to_json(rolling_price[-60:].to_frame())
+    }
+
+
+# kind -> (function, runs on the process pool)
+JOBS = {
+    "history": (history_job, False),
+    "indicators": (indicators_job, False),
+    "fundamentals": (fundamentals_job, False),
+    "forecast": (forecast_job, True)
+}
+
+
+# --- Job queue ---
+class JobQueue:
+    """
+    Bounded set of jobs with IDs, run on the model worker pool or the page fetch threads.
+
+    Args:
+        max_jobs (int): Jobs queued or running at once.
+        ttl (float): Seconds a finished job is kept for polling and reuse.
+    """
+
+    def __init__(self, max_jobs=SERVICE_MAX_JOBS, ttl=SERVICE_JOB_TTL_SECONDS):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._jobs = {}
+        self._by_request = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, params):
+        """
+        Queue a job, or return the pending or recent job for the same request.
+
+        Args:
+            kind (str): One of JOBS.
+            params (dict): Keyword arguments for the job function.
+
+        Returns:
+            dict: Job status, as returned by `get` without the result.
+
+        Raises:
+            KeyError: Unknown kind.
+            TypeError: Parameters that do not match the job function.
+            QueueFull: SERVICE_MAX_JOBS jobs are already queued or running.
+        """
+        fn, on_pool = JOBS[kind]
+        inspect.signature(fn).bind(**params)
+        request = (kind, json.dumps(params, sort_keys=True))
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(self._by_request.get(request))
+            if job is not None and job["status"] != "failed":
+                increment("service_jobs_total", kind=kind, result="reused")
+                return self._status(job)
+            if sum(1 for job in self._jobs.values() if job["future"] is not None) >= self.max_jobs:
+                increment("service_jobs_total", kind=kind, result="rejected")
+                raise QueueFull(f"{self.max_jobs} jobs already queued or running")
+
+            job = {"id": uuid.uuid4().hex, "kind": kind, "params": params, "status": "queued",
+                   "submitted": time.time(), "finished": None, "result": None, "error": None,
+                   "future": None}
+            self._jobs[job["id"]] = job
+            self._by_request[request] = job["id"]
+            if on_pool:
+                from pages.utils.workers import get_pool
+                job["future"] = get_pool().submit(fn, **params)
+            else:
+                from pages.utils.page_loader import submit
+                job["future"] = submit(f"service.{kind}", fn, **params)
+            increment("service_jobs_total", kind=kind, result="queued")
+        job["future"].add_done_callback(lambda future, job=job: self._finish(job, future))
+        return self._status(job)
+
+    def _finish(self, job, future):
+        error = future.exception()
+        with self._lock:
+            job["finished"] = time.time()
+            if error is None:
+                job["status"], job["result"] = "done", future.result()
+            else:
+                job["status"] = "failed"
+                job["error"] = "".join(traceback.format_exception_only(type(error), error)).strip()
+            job["future"] = None
+        observe("service_job_seconds", job["finished"] - job["submitted"], kind=job["kind"])
+        increment("service_jobs_total", kind=job["kind"], result=job["status"])
+
+    def _prune(self):
+        # Caller holds the lock
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["finished"] is not None and time.time() - job["finished"] > self.ttl]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            request = (job["kind"], json.dumps(job["params"], sort_keys=True))
+            if self._by_request.get(request) == job_id:
+                del self._by_request[request]
+
+    def _status(self, job, with_result=False):
+        status = job["status"]
+        if status == "queued" and job["future"] is not None and job["future"].running():
+            status = "running"
+        ended = job["finished"] or time.time()
+        payload = {"id": job["id"], "kind": job["kind"], "params": job["params"], "status": status,
+                   "seconds": round(ended - job["submitted"], 3), "error": job["error"]}
+        if status == "queued":
+            payload["position"] = sum(1 for other in self._jobs.values()
+                                      if other["future"] is not None and other["submitted"] < job["submitted"])
+        if with_result:
+            payload["result"] = job["result"]
+        return payload
+
+    def get(self, job_id):
+        """Return the status and result of a job, or None if it is unknown or expired."""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            return self._status(job, with_result=True) if job is not None else None
+
+    def list(self):
+        """Return the status of every job still kept, oldest first."""
+        with self._lock:
+            self._prune()
+            return [self._status(job) for job in sorted(self._jobs.values(), key=lambda job: job["submitted"])]
+
+    def pending(self):
+        """Number of jobs queued or running."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["future"] is not None)
+
+
+# --- HTTP API ---
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON API over a JobQueue (set as the server's `jobs` attribute)."""
+
+    def _send(self, code, payload, content_type="application/json"):
+        body = payload.encode() if isinstance(payload, str) else json.dumps(payload, default=str).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if code == 503:
+            self.send_header("Retry-After", "5")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        jobs = self.server.jobs
+        if path == "/health":
+            self._send(200, {"status": "ok", "pending": jobs.pending(), "max_jobs": jobs.max_jobs})
+        elif path == "/metrics":
+            self._send(200, prometheus_text(), "text/plain; version=0.0.4")
+        elif path == "/jobs":
+            self._send(200, jobs.list())
+        elif path.startswith("/jobs/"):
+            job = jobs.get(path[len("/jobs/"):])
+            if job is None:
+                self._send(404, {"error": "unknown or expired job"})
+            else:
+                self._send(200, job)
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            kind, params = request["kind"], dict(request.get("params") or {})
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {"error": 'expected {"kind": ..., "params": {...}}'})
+            return
+        if kind not in JOBS:
+            self._send(400, {"error": f"unknown kind {kind!r}, expected one of {sorted(JOBS)}"})
+            return
+        try:
+            self._send(202, self.server.jobs.submit(kind, params))
+        except QueueFull as error:
+            self._send(503, {"error": str(error)})
+        except TypeError as error:
+            # Parameters that do not match the job function
+            self._send(400, {"error": str(error)})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host=SERVICE_HOST, port=SERVICE_PORT, jobs=None):
+    """
+    Create the HTTP server (one thread per connection) without starting it.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind (0 picks a free one).
+        jobs (JobQueue, optional): Queue to serve, a new one by default.
+
+    Returns:
+        ThreadingHTTPServer: Server; call serve_forever() to run it.
+    """
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.jobs = jobs or JobQueue()
+    return server
+
+
+# --- Client ---
+class ServiceClient:
+    """
+    Minimal client for the service.
+
+    Args:
+        base_url (str): Service URL (e.g., "http://127.0.0.1:8502").
+        timeout (float): Per-request timeout in seconds.
+    """
+
+    def __init__(self, base_url, timeout=5.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            try:
+                message = json.loads(error.read()).get("error", error.reason)
+            except ValueError:
+                message = error.reason
+            raise ServiceError(f"{error.code}: {message}") from error
+        except (urllib.error.URLError, OSError) as error:
+            raise ServiceError(f"service unreachable ({error})") from error
+
+    def submit(self, kind, **params):
+        """Submit a job and return its status (with the job "id")."""
+        return self._request("/jobs", {"kind": kind, "params": params})
+
+    def job(self, job_id):
+        """Return the status of a job, with its "result" once done."""
+        return self._request(f"/jobs/{job_id}")
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve history, indicators, fundamentals and forecast jobs over HTTP.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--max-jobs", type=int, default=SERVICE_MAX_JOBS, help="Jobs queued or running at once")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, JobQueue(args.max_jobs))
+    print(f"Serving on http://{args.host}:{server.server_address[1]} (max {args.max_jobs} jobs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the package module so pool jobs pickle as pages.utils.service.*
+    # rather than __main__.*, which workers do not import
+    from pages.utils import service
+    sys.exit(service.main())
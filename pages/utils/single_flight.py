@@ -0,0 +1,67 @@
+import threading
+
+from pages.utils.metrics import increment
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Process-wide request coalescing: while a computation for a key is running,
+    identical requests from other threads (other sessions' reruns) wait for it
+    and share its result instead of repeating the work.
+
+    Results are shared, not copied, so callers must treat them as read-only.
+
+    Args:
+        name (str): Name used in the single_flight_total metric.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Return fn(), running it at most once at a time per key.
+
+        Args:
+            key (hashable): Identity of the request.
+            fn (callable): Zero-argument function computing the result.
+
+        Returns:
+            object: The result of the in-flight or new computation. An exception
+                raised by the computation is raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            increment("single_flight_total", flight=self.name, role="shared")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        increment("single_flight_total", flight=self.name, role="leader")
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
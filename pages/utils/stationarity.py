@@ -0,0 +1,141 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pages.utils.config import MAX_DIFFERENCING_ORDER, STATIONARITY_METHOD
+from pages.utils.model_cache import ModelCache, fingerprint
+
+
+# Stationarity reports keyed by data fingerprint and test settings
+_reports = ModelCache(maxsize=256, name="stationarity")
+
+
+# --- ADF test ---
+def adf_test(values):
+    """
+    Augmented Dickey-Fuller test with a constant and AIC lag selection.
+
+    Matches statsmodels' adfuller(values) (regression="c", autolag="AIC"), but
+    scores every candidate lag from one QR factorisation instead of one OLS fit per lag.
+
+    Args:
+        values (np.ndarray): 1D float series.
+
+    Returns:
+        tuple[float, float, int]: (ADF statistic, p-value, used lag).
+    """
+    n = len(values)
+    maxlag = int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0)))
+    maxlag = min(n // 2 - 2, maxlag)
+    if maxlag < 0:
+        raise ValueError("Series is too short for the ADF test")
+
+    diff = np.diff(values)
+    design, target = _adf_design(values, diff, maxlag)
+
+    # Residual sum of squares for every nested lag set [const, level, lag 1..L]
+    q, _ = np.linalg.qr(design)
+    projections = np.cumsum((q.T @ target) ** 2)
+    ssr = target @ target - projections[1:]
+    nobs = len(target)
+    params = np.arange(2, maxlag + 3)
+    aic = nobs * np.log(ssr / nobs) + 2 * params
+    bestlag = int(np.argmin(aic))
+
+    # Refit with the chosen lag on the longest sample it allows
+    design, target = _adf_design(values, diff, bestlag)
+    coef, ssr, _, _ = np.linalg.lstsq(design, target, rcond=None)
+    dof = len(target) - design.shape[1]
+    ssr = ssr[0] if len(ssr) else float(np.sum((target - design @ coef) ** 2))
+    xtx_inv = np.linalg.inv(design.T @ design)
+    stat = float(coef[1] / np.sqrt(ssr / dof * xtx_inv[1, 1]))
+    from statsmodels.tsa.adfvalues import mackinnonp
+    return stat, float(mackinnonp(stat, regression="c", N=1)), bestlag
+
+
+def _adf_design(values, diff, lag):
+    # Rows t = lag..len(diff)-1: regress diff[t] on [1, values[t], diff[t-1], ..., diff[t-lag]]
+    nobs = len(diff) - lag
+    design = np.empty((nobs, lag + 2))
+    design[:, 0] = 1.0
+    design[:, 1] = values[lag:lag + nobs]
+    for k in range(1, lag + 1):
+        design[:, k + 1] = diff[lag - k:lag - k + nobs]
+    return design, diff[lag:]
+
+
+def kpss_pvalue(values):
+    """KPSS p-value (level stationarity); small values reject stationarity."""
+    from statsmodels.tsa.stattools import kpss
+
+    with warnings.catch_warnings():
+        # p-values outside the lookup table are clipped, which is fine for a yes/no decision
+        warnings.simplefilter("ignore")
+        return float(kpss(values, regression="c", nlags="auto")[1])
+
+
+# --- Differencing order ---
+def stationarity_report(series, max_d=MAX_DIFFERENCING_ORDER, method=STATIONARITY_METHOD):
+    """
+    Test every differencing order 0..max_d of a series in one pass.
+
+    All differences are written into one preallocated buffer, and results are
+    memoized per data fingerprint so reruns on the same data are free.
+
+    Args:
+        series (pd.Series or np.ndarray): Price series.
+        max_d (int): Highest differencing order to test.
+        method (str): "adf" or "adf_kpss".
+
+    Returns:
+        pd.DataFrame: One row per d with ADF statistic, ADF p-value, used lag
+            and (for "adf_kpss") KPSS p-value.
+    """
+    values = np.asarray(series, dtype=float).ravel()
+    values = values[~np.isnan(values)]
+    key = (fingerprint(values), max_d, method)
+    report = _reports.get(key)
+    if report is not None:
+        return report
+
+    n = len(values)
+    buffer = np.empty((max_d + 1, n))
+    buffer[0] = values
+    for d in range(1, max_d + 1):
+        np.subtract(buffer[d - 1, 1:n - d + 1], buffer[d - 1, :n - d], out=buffer[d, :n - d])
+
+    rows = []
+    for d in range(max_d + 1):
+        stat, p_value, lag = adf_test(buffer[d, :n - d])
+        row = {"d": d, "ADF Statistic": stat, "ADF p-value": p_value, "Lag": lag}
+        if method == "adf_kpss":
+            row["KPSS p-value"] = kpss_pvalue(buffer[d, :n - d])
+        rows.append(row)
+
+    report = pd.DataFrame(rows).set_index("d")
+    _reports.put(key, report)
+    return report
+
+
+def differencing_order(series, max_d=MAX_DIFFERENCING_ORDER, method=STATIONARITY_METHOD, alpha=0.05):
+    """
+    Smallest differencing order that makes the series stationary, capped at max_d.
+
+    Args:
+        series (pd.Series or np.ndarray): Price series.
+        max_d (int): Highest differencing order considered.
+        method (str): "adf" (ADF p-value <= alpha) or "adf_kpss" (additionally
+            requires the KPSS p-value > alpha).
+        alpha (float): Significance level.
+
+    Returns:
+        int: Differencing order d.
+    """
+    report = stationarity_report(series, max_d, method)
+    stationary = report["ADF p-value"] <= alpha
+    if method == "adf_kpss":
+        stationary &= report["KPSS p-value"] > alpha
+    if stationary.any():
+        return int(stationary.idxmax())
+    return max_d
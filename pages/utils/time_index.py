@@ -0,0 +1,112 @@
+import threading
+import weakref
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+
+# Periods whose cutoffs are precomputed (same semantics as the original filter_data)
+PERIOD_OFFSETS = {
+    "5d": relativedelta(days=5),
+    "1mo": relativedelta(months=1),
+    "6mo": relativedelta(months=6),
+    "1y": relativedelta(years=1),
+    "5y": relativedelta(years=5)
+}
+
+_indexes = {}
+_indexes_guard = threading.Lock()
+
+
+class TimeIndex:
+    """
+    Dates of a price frame parsed and sorted once, with the first row position of
+    every supported period precomputed by binary search.
+
+    Args:
+        dates (array-like): Bar dates in row order.
+    """
+
+    def __init__(self, dates):
+        values = pd.DatetimeIndex(pd.to_datetime(dates)).as_unit("ns").asi8
+        self.sorted = bool(len(values) < 2 or np.all(values[1:] >= values[:-1]))
+        # Unsorted input is read through an argsort so slices stay date-ordered
+        self.order = None if self.sorted else np.argsort(values, kind="stable")
+        self.values = values if self.sorted else values[self.order]
+        self.cutoffs = {}
+        if len(self.values):
+            last = pd.Timestamp(self.values[-1])
+            for period, offset in PERIOD_OFFSETS.items():
+                self.cutoffs[period] = self._after(last - offset)
+            self.cutoffs["ytd"] = self._after(datetime(last.year, 1, 1))
+
+    def __len__(self):
+        return len(self.values)
+
+    def _after(self, date):
+        # Rows strictly after date, matching the original `Date > cutoff` mask
+        return int(np.searchsorted(self.values, pd.Timestamp(date).value, side="right"))
+
+    def position(self, num_period):
+        """
+        First row of a period.
+
+        Args:
+            num_period (int or str): Row count (e.g., 10) or period string (e.g., "6mo", "max").
+
+        Returns:
+            int: Position of the first row inside the period (0 for "max" or unknown periods).
+        """
+        if isinstance(num_period, int):
+            return max(len(self.values) - num_period, 0)
+        return self.cutoffs.get(num_period, 0)
+
+    def slice(self, dataframe, num_period):
+        """
+        Rows of dataframe inside a period: a zero-copy view when the dates are sorted.
+
+        Args:
+            dataframe (pd.DataFrame): Frame the index was built from.
+            num_period (int or str): Row count or period string.
+
+        Returns:
+            pd.DataFrame: Rows inside the period, in date order.
+        """
+        start = self.position(num_period)
+        if self.sorted:
+            return dataframe.iloc[start:]
+        return dataframe.iloc[self.order[start:]]
+
+
+def time_index(dataframe):
+    """
+    Return the TimeIndex of a price frame (its 'Date' column, or its index),
+    building it once per frame object and sharing it between chart builders.
+
+    Args:
+        dataframe (pd.DataFrame): Price frame; treated as immutable once indexed.
+
+    Returns:
+        TimeIndex: Index for the frame.
+    """
+    key = id(dataframe)
+    with _indexes_guard:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is dataframe:
+            return entry[1]
+
+    dates = dataframe['Date'] if 'Date' in dataframe.columns else dataframe.index
+    index = TimeIndex(dates)
+    ref = weakref.ref(dataframe, lambda _, key=key: _forget(key))
+    with _indexes_guard:
+        _indexes[key] = (ref, index)
+    return index
+
+
+def _forget(key):
+    with _indexes_guard:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is None:
+            del _indexes[key]
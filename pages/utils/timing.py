@@ -0,0 +1,47 @@
+import logging
+import threading
+import time
+
+from pages.utils.metrics import observe, set_gauge
+
+
+logger = logging.getLogger(__name__)
+
+# First import of this module approximates when the server started serving pages
+PROCESS_STARTED = time.perf_counter()
+
+_first_paint = set()
+_first_paint_guard = threading.Lock()
+
+
+def mark_rendered(page, started):
+    """
+    Record how long a page script took to render and log it.
+
+    The first render of each page in the process is exported as its cold
+    first-paint time (including any module imports the page triggered) in the
+    page_first_paint_seconds gauge, and relative to the process start in
+    page_first_paint_since_start_seconds.
+
+    Args:
+        page (str): Page name.
+        started (float): time.perf_counter() taken at the top of the page script.
+
+    Returns:
+        float: Render time of this run in seconds.
+    """
+    now = time.perf_counter()
+    elapsed = now - started
+    observe("page_render_seconds", elapsed, page=page)
+    with _first_paint_guard:
+        first = page not in _first_paint
+        _first_paint.add(page)
+    if first:
+        set_gauge("page_first_paint_seconds", round(elapsed, 4), page=page)
+        set_gauge("page_first_paint_since_start_seconds", round(now - PROCESS_STARTED, 4), page=page)
+        logger.info("%s first paint in %.3fs (%.3fs after process start)",
+                    page, elapsed, now - PROCESS_STARTED)
+    else:
+        logger.debug("%s rendered in %.3fs", page, elapsed)
+    return elapsed
+
@@ -1,41 +1,120 @@
 import plotly.graph_objects as go
-import dateutil
+import numpy as np
 import pandas as pd
-import pandas_ta as pta
-import datetime
+from pages.utils.config import MAX_CHART_POINTS
+from pages.utils.indicators import compute_indicators
+from pages.utils.time_index import time_index
 
 
 def filter_data(dataframe, num_period):
-    # Ensure 'Date' is datetime
+    """
+    Rows of a price frame inside a period.
+
+    Dates are parsed once per frame and period cutoffs found by binary search
+    (see time_index), so the result is a zero-copy view and the cost does not
+    grow with the length of the history.
+
+    Args:
+        dataframe (pd.DataFrame): Price frame with a 'Date' column (or a Date index).
+        num_period (int or str): Row count (e.g., 10) or period string (e.g., "6mo", "ytd", "max").
+
+    Returns:
+        pd.DataFrame: Rows inside the period.
+    """
     if 'Date' not in dataframe.columns:
         dataframe = dataframe.reset_index()
-    dataframe['Date'] = pd.to_datetime(dataframe['Date'])
-
-    # Get last date
-    last_date = dataframe['Date'].iloc[-1]
-
-    # Calculate start date based on period
-    if num_period == '1mo':
-        date = last_date - dateutil.relativedelta.relativedelta(months=1)
-    elif num_period == '5d':
-        date = last_date - dateutil.relativedelta.relativedelta(days=5)
-    elif num_period == '6mo':
-        date = last_date - dateutil.relativedelta.relativedelta(months=6)
-    elif num_period == '1y':
-        date = last_date - dateutil.relativedelta.relativedelta(years=1)
-    elif num_period == '5y':
-        date = last_date - dateutil.relativedelta.relativedelta(years=5)
-    elif num_period == 'ytd':
-        date = datetime.datetime(last_date.year, 1, 1)
-    else:
-        date = dataframe['Date'].iloc[0]
-
-    # Filter data
-    return dataframe[dataframe['Date'] > date]
+    return time_index(dataframe).slice(dataframe, num_period)
+
+
+def _period_rows(dataframe, indicators, num_period):
+    # Same period slice of the price frame and its row-aligned indicator frame
+    start = time_index(dataframe).position(num_period)
+    return dataframe.iloc[start:], indicators.iloc[start:]
+
+
+# --- Downsampling ---
+def lttb_indices(x, y, threshold):
+    """
+    Pick the indices of the points to keep with Largest-Triangle-Three-Buckets.
+
+    Args:
+        x (np.ndarray): Increasing x values (float).
+        y (np.ndarray): y values.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices into x and y.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs((x[selected] - avg_x) * (y[start:end] - y[selected])
+                      - (x[selected] - x[start:end]) * (avg_y - y[selected]))
+        selected = start + int(np.argmax(area))
+        keep[i + 1] = selected
+    return keep
+
+
+def downsample_line(dates, values, threshold=MAX_CHART_POINTS):
+    """
+    Downsample one line trace with LTTB, dropping missing values first.
+
+    Args:
+        dates (pd.Series): Trace x values.
+        values (pd.Series): Trace y values.
+        threshold (int): Point budget.
+
+    Returns:
+        tuple[pd.Series, pd.Series]: Downsampled (dates, values).
+    """
+    dates, values = pd.Series(dates).reset_index(drop=True), pd.Series(values).reset_index(drop=True)
+    mask = values.notna().to_numpy()
+    dates, values = dates[mask], values[mask]
+    if len(values) <= threshold:
+        return dates, values
+    x = dates.to_numpy().astype("datetime64[ns]").astype("int64").astype(float)
+    keep = lttb_indices(x, values.to_numpy(dtype=float), threshold)
+    return dates.iloc[keep], values.iloc[keep]
+
+
+def downsample_ohlc(dataframe, threshold=MAX_CHART_POINTS):
+    """
+    Aggregate OHLC bars into at most `threshold` buckets (first open, max high,
+    min low, last close), so candles stay faithful to the price range.
+
+    Args:
+        dataframe (pd.DataFrame): Bars with Date, Open, High, Low and Close columns.
+        threshold (int): Maximum number of candles.
+
+    Returns:
+        pd.DataFrame: Aggregated bars.
+    """
+    if len(dataframe) <= threshold:
+        return dataframe
+    buckets = np.arange(len(dataframe)) * threshold // len(dataframe)
+    grouped = dataframe.groupby(buckets)
+    return pd.DataFrame({
+        'Date': grouped['Date'].first(),
+        'Open': grouped['Open'].first(),
+        'High': grouped['High'].max(),
+        'Low': grouped['Low'].min(),
+        'Close': grouped['Close'].last()
+    })
 
 
 def candlestick(dataframe, num_period):
-    dataframe = filter_data(dataframe, num_period)
+    dataframe = downsample_ohlc(filter_data(dataframe, num_period))
     fig = go.Figure()
     fig.add_trace(go.Candlestick(
         x=dataframe['Date'],
@@ -53,16 +132,18 @@ def candlestick(dataframe, num_period):
     return fig
 
 
-def RSI(dataframe, num_period):
-    dataframe['RSI'] = pta.rsi(dataframe['Close'])
-    dataframe = filter_data(dataframe, num_period)
+def RSI(dataframe, num_period, indicators=None):
+    if indicators is None:
+        indicators = compute_indicators(dataframe)
+    dataframe, indicators = _period_rows(dataframe, indicators, num_period)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe.RSI,
-                             line=dict(width=2, color='blue'), name='RSI'))
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=[70]*len(dataframe),
-                             line=dict(width=2, color='red', dash='dash'), name='Overbought'))
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=[30]*len(dataframe),
-                             line=dict(width=2, color='green', dash='dash'), name='Oversold'))
+    x, y = downsample_line(dataframe['Date'], indicators['RSI'])
+    fig.add_trace(go.Scatter(x=x, y=y, line=dict(width=2, color='blue'), name='RSI'))
+    # Reference levels are layout shapes, not full-length data traces
+    fig.add_hline(y=70, line=dict(width=2, color='red', dash='dash'),
+                  annotation_text='Overbought', annotation_position='top left')
+    fig.add_hline(y=30, line=dict(width=2, color='green', dash='dash'),
+                  annotation_text='Oversold', annotation_position='bottom left')
     fig.update_layout(
         yaxis_range=[0, 100],
         height=250,
@@ -78,14 +159,9 @@ def close_chart(dataframe, num_period=False):
     if num_period:
         dataframe = filter_data(dataframe, num_period)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe['Open'],
-                             mode='lines', line=dict(width=2, color="blue"), name='Open'))
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe['Close'],
-                             mode='lines', line=dict(width=2, color='white'), name='Close'))
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe['High'],
-                             mode='lines', line=dict(width=2, color='orange'), name='High'))
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe['Low'],
-                             mode='lines', line=dict(width=2, color='red'), name='Low'))
+    for column, color in [('Open', 'blue'), ('Close', 'white'), ('High', 'orange'), ('Low', 'red')]:
+        x, y = downsample_line(dataframe['Date'], dataframe[column])
+        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', line=dict(width=2, color=color), name=column))
     fig.update_xaxes(rangeslider_visible=True)
     fig.update_layout(
         height=500,
@@ -96,25 +172,25 @@ def close_chart(dataframe, num_period=False):
     return fig
 
 
-def Moving_average(dataframe, num_period):
-    dataframe['SMA_50'] = pta.sma(dataframe['Close'], 50)
-    dataframe = filter_data(dataframe, num_period)
+def Moving_average(dataframe, num_period, indicators=None):
+    if indicators is None:
+        indicators = compute_indicators(dataframe)
+    dataframe, indicators = _period_rows(dataframe, indicators, num_period)
     fig = close_chart(dataframe)
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe['SMA_50'],
-                             mode='lines', line=dict(width=2, color='purple'), name='SMA 50'))
+    x, y = downsample_line(dataframe['Date'], indicators['SMA_50'])
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', line=dict(width=2, color='purple'), name='SMA 50'))
     return fig
 
 
-def MACD(dataframe, num_period):
-    macd = pta.macd(dataframe['Close']).iloc[:, 0]
-    macd_signal = pta.macd(dataframe['Close']).iloc[:, 1]
-    dataframe['MACD'] = macd
-    dataframe['MACD Signal'] = macd_signal
-    dataframe = filter_data(dataframe, num_period)
+def MACD(dataframe, num_period, indicators=None):
+    if indicators is None:
+        indicators = compute_indicators(dataframe)
+    dataframe, indicators = _period_rows(dataframe, indicators, num_period)
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe['MACD'],
-                             line=dict(width=2, color='blue'), name='MACD'))
-    fig.add_trace(go.Scatter(x=dataframe['Date'], y=dataframe['MACD Signal'],
+    x, y = downsample_line(dataframe['Date'], indicators['MACD'])
+    fig.add_trace(go.Scatter(x=x, y=y, line=dict(width=2, color='blue'), name='MACD'))
+    x, y = downsample_line(dataframe['Date'], indicators['MACD Signal'])
+    fig.add_trace(go.Scatter(x=x, y=y,
                              line=dict(width=2, color='red', dash='dash'), name='Signal'))
     fig.update_layout(
         height=250,
@@ -158,3 +234,55 @@ def Moving_average_forecast(forecast, horizon=30):
 
     return fig
 
+
+
+# --- CAPM charts ---
+def beta_chart(capm_table):
+    table = capm_table.sort_values('Beta')
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=table.index, y=table['Beta'], marker_color='#2196F3', name='Beta'))
+    fig.add_hline(y=1, line=dict(width=2, color='white', dash='dash'), annotation_text='Market')
+    fig.update_layout(
+        height=350,
+        margin=dict(l=0, r=20, t=20, b=0),
+        plot_bgcolor='black',
+        paper_bgcolor='#17181A'
+    )
+    return fig
+
+
+def security_market_line(capm_table, risk_free_rate, market_return):
+    betas = [0, max(2.0, float(capm_table['Beta'].max()))]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=betas, y=[risk_free_rate + b * (market_return - risk_free_rate) for b in betas],
+                             mode='lines', line=dict(width=2, color='white', dash='dash'),
+                             name='Security Market Line'))
+    fig.add_trace(go.Scatter(x=capm_table['Beta'], y=capm_table['Annual Return'], mode='markers+text',
+                             text=capm_table.index, textposition='top center',
+                             marker=dict(size=9, color='#FF9800'), name='Realised Return'))
+    fig.update_layout(
+        height=450,
+        xaxis_title='Beta',
+        yaxis_title='Annual Return',
+        yaxis_tickformat='.0%',
+        margin=dict(l=0, r=20, t=20, b=0),
+        plot_bgcolor='black',
+        paper_bgcolor='#17181A'
+    )
+    return fig
+
+
+def rolling_beta_chart(betas):
+    fig = go.Figure()
+    for ticker in betas.columns:
+        x, y = downsample_line(betas.index.to_series(), betas[ticker])
+        fig.add_trace(go.Scatter(x=x, y=y, mode='lines', line=dict(width=2), name=ticker))
+    fig.add_hline(y=1, line=dict(width=1, color='white', dash='dash'))
+    fig.update_layout(
+        height=400,
+        margin=dict(l=0, r=20, t=20, b=0),
+        plot_bgcolor='black',
+        paper_bgcolor='#17181A',
+        legend=dict(orientation="h", y=1.02, x=1, xanchor='right')
+    )
+    return fig
@@ -0,0 +1,120 @@
+import sys
+import types
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from pages.utils.config import MODEL_WORKERS, PRECOMPUTE_WORKERS
+
+
+# Modules imported once in the fork server, so every worker starts with them loaded
+WORKER_PRELOAD = [
+    "statsmodels.tsa.arima.model",
+    "pages.utils.models_trainer",
+    "pages.utils.order_search",
+    "pages.utils.backtest"
+]
+
+_pool = None
+_precompute_pool = None
+_pool_lock = threading.Lock()
+_start_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _without_main_script():
+    # Streamlit runs each page script as __main__, and spawn/forkserver workers
+    # re-import __main__ from its file. Hide the page script while a worker
+    # starts so the worker does not re-run the page.
+    with _start_lock:
+        main_module = sys.modules["__main__"]
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main_module
+
+
+if "forkserver" in multiprocessing.get_all_start_methods():
+    from multiprocessing.context import ForkServerContext as _BaseContext, ForkServerProcess as _BaseProcess
+else:
+    from multiprocessing.context import SpawnContext as _BaseContext, SpawnProcess as _BaseProcess
+
+
+class WorkerProcess(_BaseProcess):
+    """Pool worker process that never re-imports the Streamlit page script."""
+
+    def start(self):
+        with _without_main_script():
+            super().start()
+
+
+class WorkerContext(_BaseContext):
+    """Fork-server (or spawn) context that starts WorkerProcess workers."""
+    Process = WorkerProcess
+
+
+def get_pool():
+    """
+    Return the process pool shared by the model-fitting helpers.
+
+    The pool is created on first use with MODEL_WORKERS processes and lives for
+    the rest of the process, so workers only pay their import cost once.
+    Workers come from a fork server (spawn where that is unavailable), which is
+    safe to start from Streamlit's multi-threaded server.
+
+    Returns:
+        ProcessPoolExecutor: Shared pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = new_pool(MODEL_WORKERS)
+        return _pool
+
+
+def get_precompute_pool():
+    """
+    Return the after-close scheduler's own pool of PRECOMPUTE_WORKERS processes,
+    so a full refresh never queues ahead of interactive order searches and backtests.
+
+    Returns:
+        ProcessPoolExecutor: Scheduler pool.
+    """
+    global _precompute_pool
+    with _pool_lock:
+        if _precompute_pool is None:
+            _precompute_pool = new_pool(PRECOMPUTE_WORKERS)
+        return _precompute_pool
+
+
+def new_pool(max_workers):
+    """
+    Create a process pool of WorkerProcess workers with the model modules preloaded.
+
+    Args:
+        max_workers (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: New pool, owned by the caller.
+    """
+    context = WorkerContext()
+    if context.get_start_method() == "forkserver":
+        context.set_forkserver_preload(WORKER_PRELOAD)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def terminate(pool):
+    """
+    Kill the worker processes of a pool the caller owns and shut it down, abandoning
+    whatever they run (e.g. a task past its time limit). Killing the whole process
+    means no lock or half-finished write is left behind in a worker that is reused.
+
+    Args:
+        pool (ProcessPoolExecutor): Pool running nothing else that must survive.
+    """
+    # No public API for this before Python 3.14 (ProcessPoolExecutor.terminate_workers)
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,63 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from pages.utils.compact import CompactHistory
+
+
+def _history(bars, seed):
+    dates = pd.bdate_range("2020-01-01", periods=bars, name="Date")
+    close = np.full(bars, float(seed))
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                         "Volume": np.arange(bars)}, index=dates)
+
+
+def _write_many(base_path, seed, rounds, errors):
+    compact = CompactHistory.from_frame(_history(200, seed))
+    for _ in range(rounds):
+        try:
+            compact.save(base_path)
+        except Exception as exc:
+            errors.put(repr(exc))
+
+
+def _read_many(base_path, reads, misses):
+    missed = 0
+    for _ in range(reads):
+        compact = CompactHistory.load(base_path)
+        if compact is None or len(compact) != 200:
+            missed += 1
+    misses.put(missed)
+
+
+def test_concurrent_writers_and_readers(tmp_path):
+    base_path = str(tmp_path / "AAPL.compact")
+    CompactHistory.from_frame(_history(200, 0)).save(base_path)
+
+    ctx = multiprocessing.get_context("fork")
+    errors, misses = ctx.Queue(), ctx.Queue()
+    writers = [ctx.Process(target=_write_many, args=(base_path, seed, 40, errors)) for seed in range(1, 6)]
+    readers = [ctx.Process(target=_read_many, args=(base_path, 1000, misses)) for _ in range(2)]
+    for process in writers + readers:
+        process.start()
+    for process in writers + readers:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    assert errors.empty()
+    assert [misses.get() for _ in readers] == [0, 0]
+    # Every saved version is still readable and the previous one was kept
+    assert len(CompactHistory.load(base_path)) == 200
+    assert len([p for p in tmp_path.iterdir() if p.is_dir()]) >= 2
+
+
+def test_load_follows_the_pointer_after_a_swap(tmp_path):
+    base_path = str(tmp_path / "MSFT.compact")
+    CompactHistory.from_frame(_history(200, 1)).save(base_path)
+    compact = CompactHistory.load(base_path, mmap=True)
+    CompactHistory.from_frame(_history(200, 2)).save(base_path)
+
+    # Existing memory maps stay valid and new loads see the new version
+    assert compact.columns["Close"][0] == 1.0
+    assert CompactHistory.load(base_path).columns["Close"][0] == 2.0
@@ -0,0 +1,54 @@
+import time
+
+from pages.utils import fundamentals
+from pages.utils.fundamentals import FundamentalsCache
+from pages.utils.providers import DataProvider, set_provider
+
+
+class CountingProvider(DataProvider):
+    name = "counting"
+
+    def __init__(self):
+        self.calls = []
+
+    def info(self, ticker):
+        self.calls.append(ticker)
+        return {"symbol": ticker, "call": len(self.calls)}
+
+
+def _wait_preloaded(cache, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with cache._lock:
+            if not cache._preloading:
+                return
+        time.sleep(0.01)
+    raise AssertionError("preload did not finish")
+
+
+def test_preload_rewarms_expired_entries(monkeypatch):
+    provider = CountingProvider()
+    set_provider(provider)
+    clock = [1_000_000.0]
+    monkeypatch.setattr(fundamentals.time, "time", lambda: clock[0])
+    try:
+        cache = FundamentalsCache(ttl=60)
+
+        cache.preload(["AAPL", "MSFT"])
+        _wait_preloaded(cache)
+        assert sorted(provider.calls) == ["AAPL", "MSFT"]
+
+        # Fresh entries are not fetched again
+        cache.preload(["AAPL", "MSFT"])
+        _wait_preloaded(cache)
+        assert len(provider.calls) == 2
+
+        # Past the TTL the preload refreshes them, so the next view is served from memory
+        clock[0] += 61
+        cache.preload(["AAPL", "MSFT"])
+        _wait_preloaded(cache)
+        assert len(provider.calls) == 4
+        assert cache.get("AAPL")["call"] > 2
+        assert len(provider.calls) == 4
+    finally:
+        set_provider(None)